@@ -0,0 +1,63 @@
+"""Compile every OBJ model under Objects/ into the binary mesh bundle.
+
+Run from the repository root after adding or changing a model:
+
+    python Python/build_meshes.py
+
+Besides the full geometry, every model with more faces than an entry of
+meshes.LOD_FACE_BUDGETS gets a decimated variant at that budget. Decimation
+uses trimesh's quadric simplification (pip install fast-simplification).
+"""
+
+import glob
+import os
+
+import numpy as np
+
+from meshes import (
+    BUNDLE_PATH,
+    LOD_FACE_BUDGETS,
+    OBJECTS_DIR,
+    load_trimesh,
+    lod_name,
+    mesh_arrays,
+)
+
+
+def add_mesh(arrays, name, mesh):
+    vertices, indices, normals = mesh_arrays(mesh)
+    arrays[f"{name}:vertices"] = vertices
+    arrays[f"{name}:indices"] = indices
+    arrays[f"{name}:normals"] = normals
+    print(f"{name}: {len(vertices) // 3} vertices, {len(indices) // 3} faces")
+
+
+def build_bundle():
+    arrays = {}
+    pattern = os.path.join(OBJECTS_DIR, "**", "*.obj")
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        name = os.path.relpath(path, OBJECTS_DIR).replace(os.sep, "/")
+        try:
+            mesh = load_trimesh(name)
+        except Exception as e:
+            print(f"Skipping {name}: {e}")
+            continue
+        add_mesh(arrays, name, mesh)
+
+        for budget in LOD_FACE_BUDGETS:
+            if len(mesh.faces) <= budget:
+                continue
+            try:
+                reduced = mesh.simplify_quadric_decimation(face_count=budget)
+            except Exception as e:
+                print(f"Skipping {lod_name(name, budget)}: {e}")
+                continue
+            add_mesh(arrays, lod_name(name, budget), reduced)
+
+    # Uncompressed, so every array can be read straight from the archive.
+    np.savez(BUNDLE_PATH, **arrays)
+    print(f"Wrote {BUNDLE_PATH}")
+
+
+if __name__ == "__main__":
+    build_bundle()
@@ -0,0 +1,236 @@
+import queue
+import threading
+import time
+
+import lightningchart as lc
+
+
+class SeriesBatcher:
+    """Buffers points for a group of series that share an x axis and sends them
+    to LightningChart in bulk, fitting the axis once per flush instead of once
+    per point."""
+
+    def __init__(self, series_map, axis, flush_interval=1.0):
+        self.series_map = series_map
+        self.axis = axis
+        self.flush_interval = flush_interval
+        self.buffers = {key: ([], []) for key in series_map}
+        self.last_flush = time.monotonic()
+
+    def add(self, x, values):
+        """Queue one point per series. `values` is a dict keyed like series_map
+        or a sequence in series_map order."""
+        if not isinstance(values, dict):
+            values = dict(zip(self.series_map, values))
+        for key, value in values.items():
+            if key in self.buffers:
+                xs, ys = self.buffers[key]
+                xs.append(x)
+                ys.append(value)
+
+    def maybe_flush(self):
+        """Flush if the flush interval has passed since the last flush."""
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        pending = False
+        for key, (xs, ys) in self.buffers.items():
+            if xs:
+                self.series_map[key].add(xs, ys)
+                self.buffers[key] = ([], [])
+                pending = True
+        if pending:
+            self.axis.fit()
+        self.last_flush = time.monotonic()
+
+
+class MeshSlot:
+    """Tracks the mesh model shown in one Chart3D.
+
+    Every model file is uploaded once, to its own mesh model, the first time it
+    is shown. Switching models afterwards only toggles visibility, and showing
+    the model and color already on screen sends nothing to the backend.
+    """
+
+    def __init__(self, chart, load, scale, location=(0, 0, 0)):
+        self.chart = chart
+        self.load = load
+        self.scale = scale
+        self.location = location
+        self.models = {}
+        self.colors = {}
+        self.current = None
+
+    def upload(self, model_file):
+        """Upload the geometry of `model_file` to a new mesh model, or return
+        None if it cannot be loaded."""
+        vertices, indices, normals = self.load(model_file)
+        if not (vertices and indices and normals):
+            print(f"Failed to load 3D model {model_file}")
+            return None
+        model = self.chart.add_mesh_model()
+        model.set_model_geometry(vertices=vertices, indices=indices, normals=normals)
+        model.set_scale(self.scale).set_model_location(*self.location)
+        self.models[model_file] = model
+        return model
+
+    def preload(self, model_files):
+        """Upload every model up front, hidden, so that later updates never
+        send geometry."""
+        for model_file in model_files:
+            if model_file not in self.models and self.upload(model_file):
+                self.models[model_file].set_visible(False)
+
+    def show(self, model_file, color=None):
+        """Display `model_file` (optionally in `color`, a color name). Returns
+        True if anything changed."""
+        if model_file == self.current and color == self.colors.get(model_file):
+            return False
+
+        model = self.models.get(model_file)
+        if model is None:
+            model = self.upload(model_file)
+            if model is None:
+                return False
+        elif model_file != self.current:
+            model.set_visible(True)
+
+        if self.current is not None and self.current != model_file:
+            self.models[self.current].set_visible(False)
+        self.current = model_file
+
+        if color is not None and color != self.colors.get(model_file):
+            model.set_color(lc.Color(color))
+            self.colors[model_file] = color
+        return True
+
+
+class TextBinding:
+    """Wraps a LightningChart textbox and forwards set_text / set_stroke only
+    when the text or style differs from what was last sent. Other methods are
+    passed through unchanged."""
+
+    def __init__(self, textbox):
+        self.textbox = textbox
+        self.text = None
+        self.stroke = None
+
+    def set_text(self, text):
+        if text != self.text:
+            self.textbox.set_text(text)
+            self.text = text
+        return self
+
+    def set_stroke(self, thickness, color=None):
+        stroke = (thickness, getattr(color, "hex", color))
+        if stroke != self.stroke:
+            self.textbox.set_stroke(thickness=thickness, color=color)
+            self.stroke = stroke
+        return self
+
+    def __getattr__(self, name):
+        return getattr(self.textbox, name)
+
+
+class BarChartFeed:
+    """Streams the bars of a BarChart with constant work per bar.
+
+    `load` sends every category and value in a single set_data call with the
+    bars hidden, and `reveal` then colors one bar at a time, so showing n bars
+    costs n small messages instead of resending a growing list for each bar.
+    """
+
+    HIDDEN = lc.Color(0, 0, 0, 0)
+
+    def __init__(self, chart):
+        self.chart = chart
+        self.colors = {}
+
+    def load(self, categories, values):
+        data = [
+            {"category": category, "value": float(value), "color": self.HIDDEN}
+            for category, value in zip(categories, values)
+        ]
+        self.chart.set_data(data)
+        self.colors = {entry["category"]: None for entry in data}
+
+    def reveal(self, category, color):
+        """Show the bar of `category` in `color` (an lc.Color)."""
+        if self.colors.get(category) != color.hex:
+            self.chart.set_bar_color(category, color)
+            self.colors[category] = color.hex
+
+
+def run_interleaved(streams, interval, on_step=None):
+    """Advance every stream (a generator yielding once per step) in turn, call
+    `on_step`, then wait `interval` seconds, until all of them are exhausted.
+    The streams move in lockstep, so the total time is that of the longest one."""
+    streams = list(streams)
+    while streams:
+        started = time.monotonic()
+        for stream in list(streams):
+            try:
+                next(stream)
+            except StopIteration:
+                streams.remove(stream)
+        if on_step is not None:
+            on_step()
+        if streams:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+class RenderLoop:
+    """Applies snapshots published by background producers to the charts.
+
+    Producers call `publish` from any thread. `run` blocks the calling thread,
+    which becomes the only one that touches the charts: it applies snapshots in
+    order as soon as they arrive and calls `on_frame` every `frame_interval`
+    seconds in between. If the queue is full the oldest snapshot is dropped.
+    """
+
+    def __init__(self, apply, frame_interval=0.1, on_frame=None, maxsize=16):
+        self.apply = apply
+        self.frame_interval = frame_interval
+        self.on_frame = on_frame
+        self.queue = queue.Queue(maxsize)
+        self.stopped = threading.Event()
+
+    def publish(self, snapshot):
+        while True:
+            try:
+                self.queue.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def stop(self):
+        self.stopped.set()
+
+    def apply_pending(self):
+        """Apply the snapshots queued so far without waiting for more. For
+        callers that drive the chart thread themselves, e.g. run_interleaved."""
+        while True:
+            try:
+                snapshot = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            self.apply(snapshot)
+
+    def run(self):
+        next_frame = time.monotonic()
+        while not self.stopped.is_set():
+            timeout = next_frame - time.monotonic()
+            if timeout <= 0:
+                if self.on_frame is not None:
+                    self.on_frame()
+                next_frame = time.monotonic() + self.frame_interval
+                continue
+            try:
+                snapshot = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            self.apply(snapshot)
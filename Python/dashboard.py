@@ -1,63 +1,74 @@
-import requests
+import meshes
+import open_meteo
+from chart_updates import MeshSlot, RenderLoop, SeriesBatcher, TextBinding
+from history_store import HistoryStore
+from response_cache import CURRENT_UPDATE_PERIODS
+from scheduler import PollScheduler
+from stats import RunningStats
+import numpy as np
 import pandas as pd
 import time
 import lightningchart as lc
+from collections import namedtuple
 from datetime import datetime, timedelta
+from functools import partial
 import pytz
 import os
-import trimesh
 
 lc.set_license("my-license-key")
 
 LATITUDE = 60.1699
 LONGITUDE = 24.9384
 
-AIR_QUALITY_API_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
-WIND_API_URL = "https://api.open-meteo.com/v1/forecast"
-WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"
-TEMP_API_URL = "https://api.open-meteo.com/v1/forecast"
-
-AIR_QUALITY_PARAMS = {
-    "latitude": LATITUDE,
-    "longitude": LONGITUDE,
-    "hourly": (
-        "pm10,pm2_5,nitrogen_dioxide,ozone,carbon_monoxide,"
-        "european_aqi,european_aqi_pm2_5,european_aqi_pm10,"
-        "european_aqi_nitrogen_dioxide,european_aqi_ozone,european_aqi_sulphur_dioxide,"
-        "uv_index,uv_index_clear_sky"
-    ),
-    "past_days": 1,
-    "forecast_days": 1,
-    "timezone": "auto",
-}
-
-WIND_PARAMS = {
-    "latitude": LATITUDE,
-    "longitude": LONGITUDE,
-    "hourly": "wind_direction_10m",
-    "past_days": 1,
-    "forecast_days": 1,
-    "timezone": "auto",
-}
+AIR_QUALITY_API_URL = open_meteo.AIR_QUALITY_API_URL
+WIND_API_URL = open_meteo.FORECAST_API_URL
+WEATHER_API_URL = open_meteo.FORECAST_API_URL
+TEMP_API_URL = open_meteo.FORECAST_API_URL
+
+# Historical data is loaded with one request per API host: the air-quality
+# variables from the air-quality API and the wind, weather and temperature
+# variables together from the forecast API.
+history_plan = open_meteo.RequestPlan(LATITUDE, LONGITUDE)
+history_plan.add(
+    AIR_QUALITY_API_URL,
+    hourly=[
+        "pm10",
+        "pm2_5",
+        "nitrogen_dioxide",
+        "ozone",
+        "carbon_monoxide",
+        "european_aqi",
+        "european_aqi_pm2_5",
+        "european_aqi_pm10",
+        "european_aqi_nitrogen_dioxide",
+        "european_aqi_ozone",
+        "european_aqi_sulphur_dioxide",
+        "uv_index",
+        "uv_index_clear_sky",
+    ],
+    past_days=1,
+    forecast_days=1,
+)
+history_plan.add(
+    WEATHER_API_URL,
+    hourly=[
+        "wind_direction_10m",
+        "weather_code",
+        "relative_humidity_2m",
+        "temperature_2m",
+    ],
+    past_days=1,
+    forecast_days=1,
+)
 
-# Weather API for weather_code
-WEATHER_PARAMS = {
-    "latitude": LATITUDE,
-    "longitude": LONGITUDE,
-    "hourly": "weather_code,relative_humidity_2m",
-    "past_days": 1,
-    "forecast_days": 1,
-    "timezone": "auto",
-}
+# Hours already downloaded on a previous run are loaded from here, so only the
+# missing tail of the window is requested from the API.
+history_store = HistoryStore()
 
-TEMP_PARAMS = {
-    "latitude": LATITUDE,
-    "longitude": LONGITUDE,
-    "hourly": "temperature_2m",
-    "past_days": 1,
-    "forecast_days": 1,
-    "timezone": "auto",
-}
+# "bulk" pushes the whole history into the charts at startup, "playback" replays
+# it hour by hour, PLAYBACK_SPEED hours per second.
+HISTORY_MODE = os.environ.get("HISTORY_MODE", "bulk")
+PLAYBACK_SPEED = float(os.environ.get("PLAYBACK_SPEED", "1"))
 
 # Set local timezone
 local_tz = pytz.timezone("Europe/Helsinki")
@@ -66,146 +77,85 @@ local_tz = pytz.timezone("Europe/Helsinki")
 # Data Fetching Functions
 
 
-def fetch_past_air_quality():
-    response = requests.get(AIR_QUALITY_API_URL, params=AIR_QUALITY_PARAMS)
-    response.raise_for_status()
-    data = response.json()
-    df = pd.DataFrame(data.get("hourly", {}))
-    df.rename(columns={"time": "Time"}, inplace=True)
-    df["Time"] = (
-        pd.to_datetime(df["Time"]).dt.tz_localize("UTC").dt.tz_convert(local_tz)
-    )
-    return df
+def fetch_past_data():
+    """Fetch historical air quality and weather data aligned on one hourly index."""
+    payloads = history_plan.execute(fetch=history_store.get_json)
 
-
-def fetch_past_wind_data():
-    response = requests.get(WIND_API_URL, params=WIND_PARAMS)
-    response.raise_for_status()
-    data = response.json()
-    df = pd.DataFrame(data.get("hourly", {}))
-    df.rename(columns={"time": "Time"}, inplace=True)
-    df["Time"] = (
-        pd.to_datetime(df["Time"]).dt.tz_localize("UTC").dt.tz_convert(local_tz)
-    )
-    return df
-
-
-def fetch_past_weather_data():
-    response = requests.get(WEATHER_API_URL, params=WEATHER_PARAMS)
-    response.raise_for_status()
-    data = response.json()
-    df = pd.DataFrame(data.get("hourly", {}))
-    df.rename(columns={"time": "Time"}, inplace=True)
-    df["Time"] = (
-        pd.to_datetime(df["Time"]).dt.tz_localize("UTC").dt.tz_convert(local_tz)
-    )
-    return df
-
-
-def fetch_past_temperature():
-    response = requests.get(TEMP_API_URL, params=TEMP_PARAMS)
-    response.raise_for_status()
-    data = response.json()
-
-    if "hourly" not in data:
+    forecast_data = payloads[WEATHER_API_URL]
+    if "hourly" not in forecast_data:
         raise ValueError("Unexpected API response: 'hourly' key missing")
 
-    df = pd.DataFrame(data.get("hourly", {}))
+    past_air_data = open_meteo.hourly_frame(payloads[AIR_QUALITY_API_URL], local_tz)
+    past_forecast_data = open_meteo.hourly_frame(forecast_data, local_tz)
 
-    if df.empty:
+    if past_forecast_data.empty:
         raise ValueError("Temperature data is empty")
 
-    df.rename(columns={"time": "Time"}, inplace=True)
-    df["Time"] = (
-        pd.to_datetime(df["Time"]).dt.tz_localize("UTC").dt.tz_convert(local_tz)
-    )
+    # Both hosts return the same hourly grid, so a single index join replaces
+    # the chain of merges on the Time column.
+    return past_air_data.join(past_forecast_data, how="inner").reset_index()
+
+
+# Every real-time variable of a host is requested through one plan, so a refresh
+# costs one request per feed. The fetch_real_time_* functions below only split
+# the combined payloads back out for their consumers.
+air_quality_plan = open_meteo.RequestPlan(LATITUDE, LONGITUDE)
+air_quality_plan.add(
+    AIR_QUALITY_API_URL,
+    current=[
+        "pm10",
+        "pm2_5",
+        "nitrogen_dioxide",
+        "ozone",
+        "carbon_monoxide",
+        "european_aqi",
+        "uv_index",
+    ],
+)
+forecast_plan = open_meteo.RequestPlan(LATITUDE, LONGITUDE)
+forecast_plan.add(
+    WEATHER_API_URL,
+    current=["weather_code", "relative_humidity_2m", "wind_direction_10m"],
+    hourly=["temperature_2m"],
+    past_days=1,
+    forecast_days=1,
+)
 
-    print("fetch_past_temperature() returned DataFrame successfully")
-    return df
 
+# Seconds one real-time tick may wait for its responses before giving up.
+REAL_TIME_DEADLINE = 5.0
 
-def fetch_real_time_air_quality():
-    real_time_params = {
-        "latitude": LATITUDE,
-        "longitude": LONGITUDE,
-        "current": "pm10,pm2_5,nitrogen_dioxide,ozone,carbon_monoxide,european_aqi",
-        "timezone": "auto",
-    }
-    response = requests.get(AIR_QUALITY_API_URL, params=real_time_params)
-    response.raise_for_status()
-    data = response.json()
 
+def fetch_real_time_data(plan):
+    """Fetch the real-time payloads of `plan`, keyed by API URL. Raises
+    TimeoutError if a host has not answered within REAL_TIME_DEADLINE."""
+    return plan.execute(deadline=REAL_TIME_DEADLINE)
+
+
+def fetch_real_time_air_quality(data):
     # Debugging: Print API response
     print("Real-time air quality response:", data)
 
     return data.get("current", {})
 
 
-def fetch_real_time_uv():
-    real_time_params = {
-        "latitude": LATITUDE,
-        "longitude": LONGITUDE,
-        "current": "uv_index",
-        "timezone": "auto",
-    }
-    response = requests.get(AIR_QUALITY_API_URL, params=real_time_params)
-    response.raise_for_status()
-    data = response.json()
-
-    # Debugging: Print API response
-    print("Real-time UV API response:", data)
-
+def fetch_real_time_uv(data):
     return data.get("current", {}).get("uv_index", 0.0)
 
 
-def fetch_real_time_wind():
-    real_time_params = {
-        "latitude": LATITUDE,
-        "longitude": LONGITUDE,
-        "current": "wind_direction_10m",
-        "timezone": "auto",
-    }
-    response = requests.get(WIND_API_URL, params=real_time_params)
-    response.raise_for_status()
-    data = response.json()
-
-    # Debugging: Print API response
-    print("Real-time Wind API response:", data)
-
+def fetch_real_time_wind(data):
     return data.get("current", {}).get("wind_direction_10m", 0)
 
 
-def fetch_real_time_weather():
-    real_time_params = {
-        "latitude": LATITUDE,
-        "longitude": LONGITUDE,
-        "current": "weather_code",
-        "timezone": "auto",
-    }
-    response = requests.get(WEATHER_API_URL, params=real_time_params)
-    response.raise_for_status()
-    data = response.json()
-
+def fetch_real_time_weather(data):
     # Debugging: Print API response
-    print("Real-time Weather API response:", data)
+    print("Real-time Weather API response:", data.get("current", {}))
 
     return data.get("current", {}).get("weather_code", 3)
 
 
-def fetch_real_time_temperature():
-    """Fetch real-time temperature and store it by day."""
-    real_time_params = {
-        "latitude": LATITUDE,
-        "longitude": LONGITUDE,
-        "hourly": "temperature_2m",
-        "past_days": 1,
-        "forecast_days": 1,
-        "timezone": "auto",
-    }
-    response = requests.get(TEMP_API_URL, params=real_time_params)
-    response.raise_for_status()
-    data = response.json()
-
+def fetch_real_time_temperature(data):
+    """Extract real-time temperature and today's high/low from the hourly data."""
     # Extract hourly temperature data
     hourly_temps = data.get("hourly", {}).get("temperature_2m", [])
     timestamps = data.get("hourly", {}).get("time", [])
@@ -213,44 +163,24 @@ def fetch_real_time_temperature():
     if not hourly_temps or not timestamps:
         return 0.0, 0.0, 0.0
 
-    # Convert timestamps to datetime objects
-    date_objects = [datetime.strptime(t, "%Y-%m-%dT%H:%M") for t in timestamps]
-
-    # Group temperatures by day
-    temp_by_day = {}
-    for i, date_obj in enumerate(date_objects):
-        day_str = date_obj.strftime("%Y-%m-%d")
-        if day_str not in temp_by_day:
-            temp_by_day[day_str] = []
-        temp_by_day[day_str].append(hourly_temps[i])
-
-    # Get today's date and ensure we have temperature data for it
+    # Today's hours are a prefix match on the ISO timestamps
     today_str = datetime.now(local_tz).strftime("%Y-%m-%d")
-    today_temps = temp_by_day.get(today_str, [])
-
-    if not today_temps:
+    today = RunningStats()
+    current_temp = None
+    for timestamp, temp in zip(timestamps, hourly_temps):
+        if timestamp.startswith(today_str) and temp is not None:
+            today.add(temp)
+            current_temp = temp
+
+    if not today.count:
         return 0.0, 0.0, 0.0  # Default in case today's data is missing
 
-    min_temp, max_temp = min(today_temps), max(today_temps)
-    current_temp = today_temps[-1]
+    min_temp, max_temp = today.min, today.max
     return current_temp, max_temp, min_temp
 
 
-def fetch_real_time_humidity():
-    """Fetch real-time humidity from the API."""
-    real_time_params = {
-        "latitude": LATITUDE,
-        "longitude": LONGITUDE,
-        "current": "relative_humidity_2m",
-        "timezone": "auto",
-    }
-    response = requests.get(WEATHER_API_URL, params=real_time_params)
-    response.raise_for_status()
-    data = response.json()
-
-    # Debugging: Print API response
-    print("Real-time Humidity API response:", data)
-
+def fetch_real_time_humidity(data):
+    """Extract real-time humidity from the forecast payload."""
     return data.get("current", {}).get(
         "relative_humidity_2m", 0.0
     )  # Default to 0.0 if missing
@@ -317,6 +247,16 @@ for i, (key, label) in enumerate(aqi_components.items()):
     series_map_aqi[key] = series
     legend_aqi.add(series)
 
+# Points for the line and area charts are buffered and sent in bulk every
+# SERIES_FLUSH_INTERVAL seconds, with one x axis fit per flush.
+SERIES_FLUSH_INTERVAL = 1.0
+line_batcher = SeriesBatcher(
+    series_map_line, line_chart.get_default_x_axis(), SERIES_FLUSH_INTERVAL
+)
+aqi_batcher = SeriesBatcher(
+    series_map_aqi, chart_aqi.get_default_x_axis(), SERIES_FLUSH_INTERVAL
+)
+
 # --- Chart 4: Radar (Spider) Chart for Air Pollution Monitoring ---
 radar_chart = dashboard.SpiderChart(
     column_index=4, row_index=0, row_span=6, column_span=4
@@ -374,17 +314,17 @@ location_textbox = (
     .set_text_font(30, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
 )
-date_textbox = (
+date_textbox = TextBinding(
     chart_xy.add_textbox(datetime.now(local_tz).strftime("%Y-%m-%d"), 0.5, 0.48)
     .set_text_font(26, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
 )
-day_textbox = (
+day_textbox = TextBinding(
     chart_xy.add_textbox(datetime.now(local_tz).strftime("%A"), 0.45, 0.22)
     .set_text_font(17, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
 )
-wc_hour_textbox = (
+wc_hour_textbox = TextBinding(
     chart_xy.add_textbox(datetime.now(local_tz).strftime("%H:%M:%S"), 0.58, 0.22)
     .set_text_font(17, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
@@ -406,17 +346,17 @@ chart_temp = dashboard.ChartXY(row_index=2, column_index=0, column_span=2, row_s
 chart_temp.set_title("Temperature Overview")
 
 # Temperature Labels (High, Low, Current)
-high_temp_text = (
+high_temp_text = TextBinding(
     chart_temp.add_textbox("High: --°C", 0.5, 0.8)
     .set_text_font(15, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
 )
-low_temp_text = (
+low_temp_text = TextBinding(
     chart_temp.add_textbox("Low: --°C", 0.5, 0.2)
     .set_text_font(15, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
 )
-current_temp_text = (
+current_temp_text = TextBinding(
     chart_temp.add_textbox("Current: --°C", 0.5, 0.5)
     .set_text_font(20, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
@@ -437,17 +377,17 @@ chart_air_quality = dashboard.ChartXY(
 chart_air_quality.set_title("Air Quality Overview")
 
 # Air Quality Labels
-pm10_text = (
+pm10_text = TextBinding(
     chart_air_quality.add_textbox("PM10: -- μg/m³", 0.5, 0.8)
     .set_text_font(15, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
 )
-pm2_5_text = (
+pm2_5_text = TextBinding(
     chart_air_quality.add_textbox("PM2.5: -- μg/m³", 0.5, 0.5)
     .set_text_font(15, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
 )
-aqi_text = (
+aqi_text = TextBinding(
     chart_air_quality.add_textbox("European AQI: --", 0.5, 0.2)
     .set_text_font(15, weight="bold")
     .set_stroke(thickness=0, color=lc.Color("black"))
@@ -487,8 +427,8 @@ forcasting_text.add_textbox("Hourly Forecast", 0.5, 0.5).set_text_font(
 chart_3d_weather = dashboard.Chart3D(
     row_index=7, column_index=8, row_span=1, column_span=1
 ).set_title("")
-object_weather = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project20/Objects/Weekly dash/airquality.obj"
+vertices_weather, indices_weather, normals_weather = meshes.load_mesh(
+    "Weekly dash/airquality.obj", meshes.face_budget(1, 1)
 )
 chart_3d_weather.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -500,9 +440,6 @@ chart_3d_weather.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_weather.set_camera_location(0, 1, 5)
-vertices_weather = object_weather.vertices.flatten().tolist()
-indices_weather = object_weather.faces.flatten().tolist()
-normals_weather = object_weather.vertex_normals.flatten().tolist()
 model_weather = chart_3d_weather.add_mesh_model().set_color(lc.Color("white"))
 model_weather.set_model_geometry(
     vertices=vertices_weather, indices=indices_weather, normals=normals_weather
@@ -526,8 +463,8 @@ chart_text_weather.add_textbox("Air Quality", 0.5, 0.5).set_text_font(
 chart_3d_alert = dashboard.Chart3D(
     row_index=10, column_index=8, row_span=1, column_span=1
 ).set_title("")
-object_alert = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project20/Objects/Weekly dash/PM.obj"
+vertices_alert, indices_alert, normals_alert = meshes.load_mesh(
+    "Weekly dash/PM.obj", meshes.face_budget(1, 1)
 )
 chart_3d_alert.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -539,9 +476,6 @@ chart_3d_alert.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_alert.set_camera_location(0, 1, 5)
-vertices_alert = object_alert.vertices.flatten().tolist()
-indices_alert = object_alert.faces.flatten().tolist()
-normals_alert = object_alert.vertex_normals.flatten().tolist()
 model_alert = chart_3d_alert.add_mesh_model().set_color(lc.Color("red"))
 model_alert.set_model_geometry(
     vertices=vertices_alert, indices=indices_alert, normals=normals_alert
@@ -564,8 +498,8 @@ chart_alert_alert.add_textbox("PM10", 0.5, 0.5).set_text_font(
 chart_3d_temp = dashboard.Chart3D(
     row_index=8, column_index=8, row_span=1, column_span=1
 ).set_title("")
-object_temp = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project20/Objects/Weekly dash/Snowflake.obj"
+vertices_temp, indices_temp, normals_temp = meshes.load_mesh(
+    "Weekly dash/Snowflake.obj", meshes.face_budget(1, 1)
 )
 chart_3d_temp.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -577,9 +511,6 @@ chart_3d_temp.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_temp.set_camera_location(0, 1, 5)
-vertices_temp = object_temp.vertices.flatten().tolist()
-indices_temp = object_temp.faces.flatten().tolist()
-normals_temp = object_temp.vertex_normals.flatten().tolist()
 model_temp = chart_3d_temp.add_mesh_model().set_color(lc.Color("white"))
 model_temp.set_model_geometry(
     vertices=vertices_temp, indices=indices_temp, normals=normals_temp
@@ -602,8 +533,8 @@ chart_alert_temp.add_textbox("Temperature", 0.5, 0.5).set_text_font(
 chart_3d_humidity = dashboard.Chart3D(
     row_index=9, column_index=8, row_span=1, column_span=1
 ).set_title("")
-object_humidity = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project20/Objects/Weekly dash/humidity.obj"
+vertices_humidity, indices_humidity, normals_humidity = meshes.load_mesh(
+    "Weekly dash/humidity.obj", meshes.face_budget(1, 1)
 )
 chart_3d_humidity.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -615,9 +546,6 @@ chart_3d_humidity.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_humidity.set_camera_location(0, 1, 5)
-vertices_humidity = object_humidity.vertices.flatten().tolist()
-indices_humidity = object_humidity.faces.flatten().tolist()
-normals_humidity = object_humidity.vertex_normals.flatten().tolist()
 model_humidity = chart_3d_humidity.add_mesh_model().set_color(lc.Color(102, 178, 255))
 model_humidity.set_model_geometry(
     vertices=vertices_humidity, indices=indices_humidity, normals=normals_humidity
@@ -640,8 +568,8 @@ chart_alert_humidity.add_textbox("Humidity", 0.5, 0.5).set_text_font(
 chart_3d_pressure = dashboard.Chart3D(
     row_index=11, column_index=8, row_span=1, column_span=1
 ).set_title("")
-object_pressure = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project20/Objects/Weekly dash/PM.obj"
+vertices_pressure, indices_pressure, normals_pressure = meshes.load_mesh(
+    "Weekly dash/PM.obj", meshes.face_budget(1, 1)
 )
 chart_3d_pressure.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -653,9 +581,6 @@ chart_3d_pressure.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_pressure.set_camera_location(0, 1, 5)
-vertices_pressure = object_pressure.vertices.flatten().tolist()
-indices_pressure = object_pressure.faces.flatten().tolist()
-normals_pressure = object_pressure.vertex_normals.flatten().tolist()
 model_pressure = chart_3d_pressure.add_mesh_model().set_color(lc.Color("yellow"))
 model_pressure.set_model_geometry(
     vertices=vertices_pressure, indices=indices_pressure, normals=normals_pressure
@@ -675,7 +600,6 @@ chart_alert_pressure.get_default_y_axis().set_tick_strategy("Empty").set_interva
 chart_alert_pressure.add_textbox("PM2.5", 0.5, 0.5).set_text_font(
     "20", weight="bold"
 ).set_stroke(thickness=0, color=lc.Color("black"))
-current_air_quality_model = None
 
 # ====== Step X: Add Next 6 Hours Text Boxes ======
 next_hours_textboxes = []
@@ -698,15 +622,15 @@ for i in range(6):
 
     # Calculate the time for this textbox: next hour, next+1 hour, etc.
     hour_dt = current_dt + timedelta(hours=i + 1)
-    hour_textbox = (
+    hour_textbox = TextBinding(
         hour_chart.add_textbox(hour_dt.strftime("%H:%M"), 0.5, 0.5)
         .set_text_font(20, weight="bold")
         .set_stroke(thickness=0, color=lc.Color("black"))
     )
     next_hours_textboxes.append(hour_textbox)
 
-# ====== Step X: Create Six Mesh Models for Next 6 Hours AQI ======
-next_air_quality_models = []
+# ====== Step X: Create Six 3D Charts for Next 6 Hours AQI ======
+next_air_quality_charts = []
 
 # Create six 3D charts (Row 7, Columns 10-15)
 for i in range(6):
@@ -717,10 +641,7 @@ for i in range(6):
     chart_3d_aqi.get_default_y_axis().set_tick_strategy("Empty")
     chart_3d_aqi.get_default_z_axis().set_tick_strategy("Empty")
     chart_3d_aqi.set_camera_location(0, 1, 5)
-
-    # Initialize empty model
-    model = chart_3d_aqi.add_mesh_model()
-    next_air_quality_models.append(model)
+    next_air_quality_charts.append(chart_3d_aqi)
 
 # ====== Step X: Create Six Text Boxes for Next 6 Hours Temperature ======
 next_temperature_textboxes = []
@@ -740,7 +661,7 @@ for i in range(6):
     )
 
     # Create a placeholder textbox
-    temp_textbox = (
+    temp_textbox = TextBinding(
         temp_chart.add_textbox(" -- °C", 0.5, 0.5)
         .set_text_font(20, weight="bold")
         .set_stroke(thickness=0, color=lc.Color("black"))
@@ -765,7 +686,7 @@ for i in range(6):
     )
 
     # Create a placeholder textbox
-    humidity_textbox = (
+    humidity_textbox = TextBinding(
         humidity_chart.add_textbox(" -- %", 0.5, 0.5)
         .set_text_font(20, weight="bold")
         .set_stroke(thickness=0, color=lc.Color("black"))
@@ -790,7 +711,7 @@ for i in range(6):
     )
 
     # Create a placeholder textbox
-    pm10_textbox = (
+    pm10_textbox = TextBinding(
         pm10_chart.add_textbox(" -- μg/m³", 0.5, 0.5)
         .set_text_font(20, weight="bold")
         .set_stroke(thickness=0, color=lc.Color("black"))
@@ -815,7 +736,7 @@ for i in range(6):
     )
 
     # Create a placeholder textbox
-    pm2_5_textbox = (
+    pm2_5_textbox = TextBinding(
         pm2_5_chart.add_textbox(" -- μg/m³", 0.5, 0.5)
         .set_text_font(20, weight="bold")
         .set_stroke(thickness=0, color=lc.Color("black"))
@@ -823,67 +744,17 @@ for i in range(6):
     next_pm2_5_textboxes.append(pm2_5_textbox)
 
 
-def load_mesh_model_air_quality(file_name):
+def load_mesh_model_air_quality(file_name, max_faces=None):
     """Load the 3D mesh model for air quality (happy, sad, smile)."""
-    obj_path = f"Objects/air quality/{file_name}"
-    if not os.path.exists(obj_path):
-        print(f"Missing model file: {obj_path}")
-        return None, None, None
-
-    try:
-        scene = trimesh.load(obj_path)
-        mesh = (
-            scene.dump(concatenate=True) if isinstance(scene, trimesh.Scene) else scene
-        )
-        vertices, indices, normals = (
-            mesh.vertices.flatten().tolist(),
-            mesh.faces.flatten().tolist(),
-            mesh.vertex_normals.flatten().tolist(),
-        )
-        return vertices, indices, normals
-    except Exception as e:
-        print(f"Error loading {obj_path}: {e}")
-        return None, None, None
+    return meshes.load_mesh(f"air quality/{file_name}", max_faces)
 
 
 def update_next_6_hour_air_quality(aqi_values):
     """Update the six 3D models based on AQI values for the next 6 hours."""
-    model_mapping = {
-        "happy": "happy.obj",
-        "smile": "smile.obj",
-        "sad": "sad.obj",
-    }
-
     for i, aqi in enumerate(aqi_values):
-        if aqi <= 20:
-            model_file = model_mapping["happy"]
-            model_color = lc.Color("green")
-        elif 21 <= aqi <= 40:
-            model_file = model_mapping["smile"]
-            model_color = lc.Color("yellow")
-        else:
-            model_file = model_mapping["sad"]
-            model_color = lc.Color("red")
-
-        # Load or reuse the model
-        if model_file in mesh_models:
-            vertices, indices, normals = mesh_models[model_file]
-        else:
-            vertices, indices, normals = load_mesh_model_air_quality(model_file)
-            if vertices and indices and normals:
-                mesh_models[model_file] = (vertices, indices, normals)
-
-        # Update the model in the corresponding chart
-        if vertices and indices and normals:
-            next_air_quality_models[i].set_model_geometry(
-                vertices=vertices, indices=indices, normals=normals
-            )
-            next_air_quality_models[i].set_scale(1.5).set_model_location(0, 0, 0)
-            next_air_quality_models[i].set_color(model_color)
-
+        model_file, color_name = aqi_models[aqi_bucket(aqi)]
+        if next_air_quality_slots[i].show(model_file, color_name):
             print(f"Updated Next 6 Hours AQI Model {i + 1}: {model_file} (AQI: {aqi})")
-        else:
-            print(f"Failed to load 3D model for AQI {aqi} at position {i + 1}")
 
 
 def update_next_hours(base_time):
@@ -894,74 +765,69 @@ def update_next_hours(base_time):
         tb.set_text(new_time)
 
 
-def update_air_quality_3d_model(european_aqi):
-    global current_air_quality_model  # Track the current air quality model
+# European AQI buckets with their mesh model and color
+aqi_models = {
+    "good": ("happy.obj", "green"),
+    "moderate": ("smile.obj", "yellow"),
+    "poor": ("sad.obj", "red"),
+}
 
-    # Select model and color based on AQI range
+
+def aqi_bucket(european_aqi):
+    """Bucket name of a European AQI value."""
     if european_aqi <= 20:
-        model_file = "happy.obj"
-        model_color = lc.Color("green")  # Green for Good Air Quality
+        return "good"
     elif 21 <= european_aqi <= 40:
-        model_file = "smile.obj"
-        model_color = lc.Color("yellow")  # Yellow for Moderate Air Quality
-    else:
-        model_file = "sad.obj"
-        model_color = lc.Color("red")  # Red for Poor Air Quality
+        return "moderate"
+    return "poor"
 
-    # Check if we already have the model cached
-    if model_file in mesh_models:
-        vertices, indices, normals = mesh_models[model_file]
-    else:
-        vertices, indices, normals = load_mesh_model_air_quality(model_file)
-        if vertices and indices and normals:
-            mesh_models[model_file] = (vertices, indices, normals)  # Cache model
 
-    if vertices and indices and normals:
-        if current_air_quality_model is not None:
-            current_air_quality_model.dispose()  # Remove old model
+def aqi_bucket_array(european_aqi):
+    """Vectorized aqi_bucket for a whole column of AQI values."""
+    aqi = np.asarray(european_aqi, dtype=float)
+    return np.select(
+        [aqi <= 20, (aqi >= 21) & (aqi <= 40)], ["good", "moderate"], "poor"
+    )
+
 
-        # Create and display new model with color
-        current_air_quality_model = chart_air_quality_3d.add_mesh_model()
-        current_air_quality_model.set_model_geometry(
-            vertices=vertices, indices=indices, normals=normals
-        )
-        current_air_quality_model.set_scale(0.6).set_model_location(0, 0, 0)
+def update_air_quality_3d_model(european_aqi):
+    show_air_quality_model(aqi_bucket(european_aqi), european_aqi)
 
-        # Apply selected color
-        current_air_quality_model.set_color(model_color)
 
+def show_air_quality_model(bucket, european_aqi):
+    model_file, color_name = aqi_models[bucket]
+    if air_quality_slot.show(model_file, color_name):
         print(f"Updated Air Quality Model: {model_file} (AQI: {european_aqi})")
-    else:
-        print(f"Failed to load 3D model for AQI {european_aqi}")
 
 
-# Dictionary to Store Loaded Mesh Models
-mesh_models = {}
+# Function to Load Mesh Model from File
+def load_mesh_model(file_name, max_faces=None):
+    return meshes.load_mesh(f"weather/{file_name}", max_faces)
 
 
-# Function to Load Mesh Model from File
-def load_mesh_model(file_name):
-    obj_path = f"Objects/weather/{file_name}"  # Change path if necessary
-    if not os.path.exists(obj_path):
-        print(f"Missing model file: {obj_path}")
-        return None, None, None
+# Each 3D condition chart keeps one uploaded mesh model per model file and only
+# toggles between them when the displayed condition changes. Models are loaded
+# at the level of detail that fits the chart's cell span.
+air_quality_slot = MeshSlot(
+    chart_air_quality_3d,
+    partial(load_mesh_model_air_quality, max_faces=meshes.face_budget(2, 2)),
+    0.6,
+)
+weather_slot = MeshSlot(
+    chart_3d, partial(load_mesh_model, max_faces=meshes.face_budget(2, 2)), 1.7
+)
 
-    try:
-        import trimesh  # Ensure trimesh is installed: pip install trimesh
-
-        scene = trimesh.load(obj_path)
-        mesh = (
-            scene.dump(concatenate=True) if isinstance(scene, trimesh.Scene) else scene
-        )
-        vertices, indices, normals = (
-            mesh.vertices.flatten().tolist(),
-            mesh.faces.flatten().tolist(),
-            mesh.vertex_normals.flatten().tolist(),
-        )
-        return vertices, indices, normals
-    except Exception as e:
-        print(f"Error loading {obj_path}: {e}")
-        return None, None, None
+# The six next-hour charts hold all AQI models preloaded, so an update only
+# flips visibility and color in the slots whose bucket changed.
+next_air_quality_slots = []
+for chart_3d_aqi in next_air_quality_charts:
+    slot = MeshSlot(
+        chart_3d_aqi,
+        partial(load_mesh_model_air_quality, max_faces=meshes.face_budget(1, 1)),
+        1.5,
+    )
+    slot.preload(model_file for model_file, _ in aqi_models.values())
+    next_air_quality_slots.append(slot)
 
 
 def update_next_6_hour_temperatures(temp_values):
@@ -1043,225 +909,183 @@ weather_mapping = {
 
 # Function to Update 3D Model in Chart3D
 def update_weather_3d_model(weather_code):
-    global current_3d_model  # Ensure we can update it dynamically
-
     model_file = weather_mapping.get(weather_code, "Overcast.obj")  # Default: Overcast
-
-    if model_file in mesh_models:
-        vertices, indices, normals = mesh_models[model_file]  # Use Cached Model
-    else:
-        vertices, indices, normals = load_mesh_model(model_file)
-        if vertices and indices and normals:
-            mesh_models[model_file] = (vertices, indices, normals)  # Store for Reuse
-
-    if vertices and indices and normals:
-        if current_3d_model is not None:
-            current_3d_model.dispose()  # Remove old model
-
-        # Create and Update New Model
-        current_3d_model = chart_3d.add_mesh_model()
-        current_3d_model.set_model_geometry(
-            vertices=vertices, indices=indices, normals=normals
-        )
-        current_3d_model.set_scale(1.7).set_model_location(0, 0, 0)
-    else:
-        print(f"Failed to load 3D model for weather code {weather_code}")
+    show_weather_model(model_file)
 
 
-current_3d_model = None
+def show_weather_model(model_file):
+    weather_slot.show(model_file)
 
 
 # Historical Data Processing
 
 # Fetch historical data first
-past_air_data = fetch_past_air_quality()
-past_wind_data = fetch_past_wind_data()
-past_weather_data = fetch_past_weather_data()
-past_temp_data = fetch_past_temperature()
-
-# Perform sequential merges with a consistent Time column
-past_data = (
-    past_air_data.merge(past_wind_data, on="Time", how="inner")
-    .merge(past_weather_data, on="Time", how="inner")
-    .merge(past_temp_data, on="Time", how="inner")
-)
-
-
-def stream_historical_data():
-    """Stream historical data hour by hour up to the current time,
-    updating charts and the next 6 hours and Weather Condition hour display."""
-    last_time = past_data.iloc[0]["Time"]
-    current_time = datetime.now(local_tz)
-    current_date = current_time.date()
-    # current_hour = current_time.hour
+past_data = fetch_past_data()
 
-    # Group historical temperatures by day for display purposes
-    past_data["Date"] = past_data["Time"].dt.date
-    temp_by_day = past_data.groupby("Date")["temperature_2m"].apply(list).to_dict()
 
-    # Compute min & max temperatures per day
-    min_temps = {date: min(temps) for date, temps in temp_by_day.items()}
-    max_temps = {date: max(temps) for date, temps in temp_by_day.items()}
+def build_replay_frame(data, until):
+    """Precompute every per-hour display payload of the historical replay.
 
-    # Set initial min/max for the first date
-    min_temp = min_temps.get(current_date, "N/A")
-    max_temp = max_temps.get(current_date, "N/A")
+    All columns are derived column-wise up front, so the replay loop only has
+    to dispatch ready-made values to the charts.
+    """
+    frame = data[data["Time"] < until].reset_index(drop=True)
+    replay = pd.DataFrame(index=frame.index)
 
-    if isinstance(max_temp, (int, float)):
-        high_temp_text.set_text(f"High: {max_temp:.1f}°C")
-    else:
-        high_temp_text.set_text("High: --°C")
-    if isinstance(min_temp, (int, float)):
-        low_temp_text.set_text(f"Low: {min_temp:.1f}°C")
-    else:
-        low_temp_text.set_text("Low: --°C")
-
-    for index, row in past_data.iterrows():
-        row_time = row["Time"]
-        row_date = row_time.date()
-        row_hour = row_time.hour
-
-        # Ensure we iterate fully through yesterday
-        if row_date == current_date - timedelta(days=1):
-            if row_hour > 23:
-                continue
+    times = frame["Time"]
+    replay["time"] = times
+    replay["timestamp"] = (times - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(
+        milliseconds=1
+    )
+    replay["date"] = times.dt.date
+    replay["date_label"] = times.dt.strftime("%Y-%m-%d")
+    replay["day_label"] = times.dt.strftime("%A")
+    replay["hour_label"] = times.dt.strftime("%H:%M")
+    replay["log_label"] = times.dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    # Display texts
+    temperature = frame["temperature_2m"]
+    daily_temps = temperature.groupby(replay["date"])
+    replay["temperature"] = temperature
+    replay["high_text"] = (
+        "High: " + daily_temps.transform("max").map("{:.1f}".format) + "°C"
+    )
+    replay["low_text"] = (
+        "Low: " + daily_temps.transform("min").map("{:.1f}".format) + "°C"
+    )
+    replay["current_temp_text"] = "Current: " + temperature.map("{:.1f}".format) + "°C"
+    replay["pm10_text"] = "PM10: " + frame["pm10"].map("{:.1f}".format) + " μg/m³"
+    replay["pm2_5_text"] = "PM2.5: " + frame["pm2_5"].map("{:.1f}".format) + " μg/m³"
+    replay["aqi_text"] = "European AQI: " + frame["european_aqi"].astype(str)
+
+    # Polar sector per hour: PM2.5 scaled by 5, placed by wind direction
+    wind_direction = frame["wind_direction_10m"].to_numpy()
+    replay["wind_direction"] = wind_direction
+    replay["sector_name"] = "PM2.5 " + frame["pm2_5"].map("{:.1f}".format) + " μg/m³"
+    replay["sector_amplitude"] = frame["pm2_5"] / 5
+    replay["sector_angle_start"] = np.where(
+        wind_direction < 100, 260 + wind_direction, -80 + wind_direction
+    )
+    replay["sector_angle_end"] = np.where(
+        wind_direction < 100, 290 + wind_direction, -100 + wind_direction
+    )
 
-        # Stop processing once we reach the current time
-        if row_time >= current_time:
-            print("Finished streaming historical data. Switching to real-time updates.")
-            return
+    # Radar rows, UV gauge and mesh choices
+    labels = list(aqi_components.values())
+    replay["radar"] = [
+        [{"axis": label, "value": value} for label, value in zip(labels, values)]
+        for values in frame[list(aqi_components)].to_numpy().tolist()
+    ]
+    replay["uv"] = frame["uv_index"]
+    weather_codes = frame["weather_code"].fillna(3).astype(int)
+    replay["weather_model"] = weather_codes.map(weather_mapping).fillna("Overcast.obj")
+    replay["european_aqi"] = frame["european_aqi"].fillna(0).astype(int)
+    replay["aqi_bucket"] = aqi_bucket_array(replay["european_aqi"])
+
+    # Values repeated into the "next 6 hours" boxes
+    replay["relative_humidity_2m"] = frame["relative_humidity_2m"]
+    replay["pm10"] = frame["pm10"]
+    replay["pm2_5"] = frame["pm2_5"]
+    replay["line_values"] = frame[list(series_map_line)].to_numpy().tolist()
+    replay["aqi_values"] = frame[list(series_map_aqi)].to_numpy().tolist()
+    return replay
+
+
+def show_replay_row(row):
+    """Set the hour-level widgets (texts, radar, gauge, 3D models and next 6
+    hours boxes) to the state of one replay row."""
+    # Update temperature and air quality displays
+    high_temp_text.set_text(row.high_text)
+    low_temp_text.set_text(row.low_text)
+    current_temp_text.set_text(row.current_temp_text)
+    pm10_text.set_text(row.pm10_text)
+    pm2_5_text.set_text(row.pm2_5_text)
+    aqi_text.set_text(row.aqi_text)
+
+    # Update Radar Chart and UV Index gauge
+    series_radar.add_points(row.radar)
+    gauge_chart.set_value(row.uv)
+
+    # Update date, day, and Weather Condition hour display
+    date_textbox.set_text(row.date_label)
+    day_textbox.set_text(row.day_label)
+    wc_hour_textbox.set_text(row.hour_label)
+
+    # Update 3D Weather Model and Air Quality 3D Model
+    show_weather_model(row.weather_model)
+    show_air_quality_model(row.aqi_bucket, row.european_aqi)
+
+    # Update the "next 6 hours" boxes, repeating this row's values.
+    update_next_hours(row.time)
+    update_next_6_hour_air_quality([row.european_aqi] * 6)
+    update_next_6_hour_temperatures([row.temperature] * 6)
+    update_next_6_hour_humidity([row.relative_humidity_2m] * 6)
+    update_next_6_hour_pm10([row.pm10] * 6)
+    update_next_6_hour_pm2_5([row.pm2_5] * 6)
+
+
+def load_historical_data():
+    """Push the whole history into the charts at once and show the state of the
+    last historical hour."""
+    replay = build_replay_frame(past_data, datetime.now(local_tz))
+    if replay.empty:
+        return
+
+    for timestamp, line_values, aqi_values in zip(
+        replay["timestamp"], replay["line_values"], replay["aqi_values"]
+    ):
+        line_batcher.add(timestamp, line_values)
+        aqi_batcher.add(timestamp, aqi_values)
+    line_batcher.flush()
+    aqi_batcher.flush()
+
+    last_row = next(replay.tail(1).itertuples(index=False))
+    show_replay_row(last_row)
+    print(f"Loaded {len(replay)} historical hours up to {last_row.log_label}.")
+
+
+def stream_historical_data(speed=1.0):
+    """Stream historical data hour by hour up to the current time,
+    updating charts and the next 6 hours and Weather Condition hour display.
+    Each historical hour takes 1 / speed seconds."""
+    replay = build_replay_frame(past_data, datetime.now(local_tz))
+    last_time = past_data.iloc[0]["Time"]
 
+    for row in replay.itertuples(index=False):
         # Simulate waiting until this row's timestamp
-        while last_time < row_time:
+        while last_time < row.time:
             print(f"Historical Time: {last_time.strftime('%Y-%m-%d %H:%M:%S')}")
             last_time += timedelta(hours=1)
-            time.sleep(1)
-
-        # If a new day has started, update temperature displays
-        if row_date != current_date:
-            current_date = row_date
-            min_temp = min_temps.get(current_date, "N/A")
-            max_temp = max_temps.get(current_date, "N/A")
-            if isinstance(max_temp, (int, float)):
-                high_temp_text.set_text(f"High: {max_temp:.1f}°C")
-            else:
-                high_temp_text.set_text("High: --°C")
-            if isinstance(min_temp, (int, float)):
-                low_temp_text.set_text(f"Low: {min_temp:.1f}°C")
-            else:
-                low_temp_text.set_text("Low: --°C")
-            print(f"Updated Historical High: {max_temp:.1f}°C, Low: {min_temp:.1f}°C")
-
-        # Update current temperature and air quality displays
-        temperature = row.get("temperature_2m", None)
-        if temperature is not None:
-            current_temp_text.set_text(f"Current: {temperature:.1f}°C")
-        else:
-            current_temp_text.set_text("Current: --°C")
-
-        pm10 = row.get("pm10", "N/A")
-        pm2_5 = row.get("pm2_5", "N/A")
-        european_aqi = row.get("european_aqi", "N/A")
-
-        if isinstance(pm10, (int, float)):
-            pm10_text.set_text(f"PM10: {pm10:.1f} μg/m³")
-        else:
-            pm10_text.set_text("PM10: -- μg/m³")
-        if isinstance(pm2_5, (int, float)):
-            pm2_5_text.set_text(f"PM2.5: {pm2_5:.1f} μg/m³")
-        else:
-            pm2_5_text.set_text("PM2.5: -- μg/m³")
-        if isinstance(european_aqi, (int, float)):
-            aqi_text.set_text(f"European AQI: {european_aqi}")
-        else:
-            aqi_text.set_text("European AQI: --")
+            time.sleep(1 / speed)
 
         # Update Polar Chart
-        wind_direction = row["wind_direction_10m"]
-        pm2_5_val = row["pm2_5"]
-        if wind_direction < 100:
-            sector = polar_chart.add_sector()
-            sector.set_name(f"PM2.5 {pm2_5_val:.1f} μg/m³")
-            sector.set_amplitude_start(0)
-            sector.set_amplitude_end(pm2_5_val / 5)
-            sector.set_angle_start(260 + wind_direction)
-            sector.set_angle_end(290 + wind_direction)
-            sector.set_color(lc.Color(0, 207, 255))
-            sector.set_stroke(color=lc.Color(0, 161, 255), thickness=1)
-        elif wind_direction >= 100:
-            sector = polar_chart.add_sector()
-            sector.set_name(f"PM2.5 {pm2_5_val:.1f} μg/m³")
-            sector.set_amplitude_start(0)
-            sector.set_amplitude_end(pm2_5_val / 5)
-            sector.set_angle_start(-80 + wind_direction)
-            sector.set_angle_end(-100 + wind_direction)
-            sector.set_color(lc.Color(0, 207, 255))
-            sector.set_stroke(color=lc.Color(0, 161, 255), thickness=1)
-
-        # Update Multi-line Chart
-        timestamp = int(row["Time"].timestamp() * 1000)
-        for key, series in series_map_line.items():
-            if key in row:
-                series.add([timestamp], [row[key]])
-        line_chart.get_default_x_axis().fit()
-
-        # Update AQI Area Chart
-        for key, series in series_map_aqi.items():
-            if key in row:
-                series.add([timestamp], [row[key]])
-        chart_aqi.get_default_x_axis().fit()
-
-        # Update Radar Chart
-        radar_data = []
-        for key, label in aqi_components.items():
-            value = row.get(key, 0)
-            radar_data.append({"axis": label, "value": value})
-        series_radar.add_points(radar_data)
-
-        # Update UV Index gauge
-        uv = row["uv_index"]
-        gauge_chart.set_value(uv)
-
-        # Update date, day, and Weather Condition hour display
-        date_textbox.set_text(row["Time"].strftime("%Y-%m-%d"))
-        day_textbox.set_text(row["Time"].strftime("%A"))
-        wc_hour_textbox.set_text(row["Time"].strftime("%H:%M"))
-
-        # Update 3D Weather Model and Air Quality 3D Model
-        weather_code = int(row.get("weather_code", 3))
-        update_weather_3d_model(weather_code)
-        european_aqi_val = int(row.get("european_aqi", 0))
-        update_air_quality_3d_model(european_aqi_val)
-
-        print(f"Historical Time: {row['Time'].strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Wind Direction: {wind_direction}, Temp: {temperature:.1f}°C")
-        time.sleep(1)
+        sector = polar_chart.add_sector()
+        sector.set_name(row.sector_name)
+        sector.set_amplitude_start(0)
+        sector.set_amplitude_end(row.sector_amplitude)
+        sector.set_angle_start(row.sector_angle_start)
+        sector.set_angle_end(row.sector_angle_end)
+        sector.set_color(lc.Color(0, 207, 255))
+        sector.set_stroke(color=lc.Color(0, 161, 255), thickness=1)
+
+        # Update Multi-line Chart and AQI Area Chart
+        line_batcher.add(row.timestamp, row.line_values)
+        aqi_batcher.add(row.timestamp, row.aqi_values)
+        line_batcher.maybe_flush()
+        aqi_batcher.maybe_flush()
+
+        show_replay_row(row)
+
+        print(f"Historical Time: {row.log_label}")
+        print(f"Wind Direction: {row.wind_direction}, Temp: {row.temperature:.1f}°C")
+        time.sleep(1 / speed)
         sector.dispose()
 
-        # Update the "next 6 hours" text boxes using this row's time as the base.
-        update_next_hours(row["Time"])
-
-        # Extract the next 6 hours AQI values
-        future_aqi_values = [row.get("european_aqi", 0) for _ in range(6)]
-        update_next_6_hour_air_quality(future_aqi_values)
-
-        # Extract the next 6 hours temperature values
-        future_temp_values = [row.get("temperature_2m", 0) for _ in range(6)]
-        update_next_6_hour_temperatures(future_temp_values)
-
-        # Extract the next 6 hours humidity values from historical data
-        future_humidity_values = [row.get("relative_humidity_2m", 0) for _ in range(6)]
-        update_next_6_hour_humidity(future_humidity_values)
-
-        # Extract the next 6 hours PM10 values from historical data
-        future_pm10_values = [row.get("pm10", 0) for _ in range(6)]
-        update_next_6_hour_pm10(future_pm10_values)
+        last_time = row.time
 
-        # Extract the next 6 hours PM2.5 values from historical data
-        future_pm2_5_values = [row.get("pm2_5", 0) for _ in range(6)]
-        update_next_6_hour_pm2_5(future_pm2_5_values)
-
-        last_time = row["Time"]
+    line_batcher.flush()
+    aqi_batcher.flush()
+    print("Finished streaming historical data. Switching to real-time updates.")
 
 
 # Global variable to store the current polar sector
@@ -1269,21 +1093,47 @@ current_sector = None
 current_radar_series = None
 
 
-def update_real_time_data():
-    global current_sector, current_radar_series
+# Immutable results of the real-time feeds, built on the scheduler thread and
+# applied to the charts on the render thread.
+AirQualitySnapshot = namedtuple(
+    "AirQualitySnapshot",
+    [
+        "time",
+        "timestamp",
+        "pm10",
+        "pm2_5",
+        "european_aqi",
+        "wind_direction",
+        "line_values",
+        "aqi_values",
+        "radar_data",
+        "uv",
+        "stale",
+    ],
+)
+ForecastSnapshot = namedtuple(
+    "ForecastSnapshot",
+    ["weather_code", "current_temp", "high_temp", "low_temp", "humidity", "stale"],
+)
 
-    real_time_air = fetch_real_time_air_quality()
-    real_time_uv = fetch_real_time_uv()
-    current_temp, high_temp, low_temp = fetch_real_time_temperature()
-    real_time_weather = fetch_real_time_weather()
-    # print("Real-time air quality data:", real_time_air)
+# Refresh period of every real-time feed in seconds: how often upstream publishes
+# a new `current` block, so no run is answered from the cache. Runs are aligned
+# to these boundaries (plus the cache grace) and spread by up to FEED_JITTER
+# seconds.
+AIR_QUALITY_PERIOD = CURRENT_UPDATE_PERIODS[AIR_QUALITY_API_URL]
+FORECAST_PERIOD = CURRENT_UPDATE_PERIODS[WEATHER_API_URL]
+FEED_JITTER = 30
+# Seconds between two clock updates on the render thread.
+FRAME_INTERVAL = 1.0
+
+
+def build_air_quality_snapshot():
+    """Fetch current air quality and shape it into an AirQualitySnapshot.
+    Runs on the scheduler thread and never touches a chart."""
+    air_data = fetch_real_time_data(air_quality_plan)[AIR_QUALITY_API_URL]
+    real_time_air = fetch_real_time_air_quality(air_data)
+    real_time_uv = fetch_real_time_uv(air_data)
     current_time = datetime.now(local_tz)
-    timestamp = int(current_time.timestamp() * 1000)
-
-    # Update date, day, and Weather Condition hour display using the real-time base
-    date_textbox.set_text(current_time.strftime("%Y-%m-%d"))
-    day_textbox.set_text(current_time.strftime("%A"))
-    wc_hour_textbox.set_text(current_time.strftime("%H:%M:%S"))
 
     try:
         pm10 = float(real_time_air.get("pm10", 0))
@@ -1293,6 +1143,69 @@ def update_real_time_data():
     except (KeyError, ValueError, TypeError):
         pm10, pm2_5, european_aqi, wind_direction = 0, 0, 0, 0
 
+    try:
+        uv = float(real_time_uv)
+    except (KeyError, ValueError, TypeError):
+        uv = 0.0
+
+    return AirQualitySnapshot(
+        time=current_time,
+        timestamp=int(current_time.timestamp() * 1000),
+        pm10=pm10,
+        pm2_5=pm2_5,
+        european_aqi=european_aqi,
+        wind_direction=wind_direction,
+        line_values={key: float(real_time_air.get(key, 0)) for key in series_map_line},
+        aqi_values={key: float(real_time_air.get(key, 0)) for key in series_map_aqi},
+        radar_data=tuple(
+            {"axis": label, "value": float(real_time_air.get(key, 0))}
+            for key, label in aqi_components.items()
+        ),
+        uv=uv,
+        stale=open_meteo.is_stale(air_data),
+    )
+
+
+def build_forecast_snapshot():
+    """Fetch current weather and today's temperatures into a ForecastSnapshot.
+    Runs on the scheduler thread and never touches a chart."""
+    forecast_data = fetch_real_time_data(forecast_plan)[WEATHER_API_URL]
+    current_temp, high_temp, low_temp = fetch_real_time_temperature(forecast_data)
+    real_time_weather = fetch_real_time_weather(forecast_data)
+
+    try:
+        weather_code = int(real_time_weather)
+    except (KeyError, ValueError, TypeError):
+        weather_code = 3
+
+    return ForecastSnapshot(
+        weather_code=weather_code,
+        current_temp=current_temp,
+        high_temp=high_temp,
+        low_temp=low_temp,
+        humidity=fetch_real_time_humidity(forecast_data),
+        stale=open_meteo.is_stale(forecast_data),
+    )
+
+
+def update_clock():
+    """Show the current date, day, time and upcoming hours. Called once per
+    frame on the render thread; unchanged texts are not resent."""
+    now = datetime.now(local_tz)
+    date_textbox.set_text(now.strftime("%Y-%m-%d"))
+    day_textbox.set_text(now.strftime("%A"))
+    wc_hour_textbox.set_text(now.strftime("%H:%M:%S"))
+    update_next_hours(now)
+    line_batcher.maybe_flush()
+    aqi_batcher.maybe_flush()
+
+
+def apply_air_quality_snapshot(snapshot):
+    global current_sector, current_radar_series
+
+    pm10, pm2_5 = snapshot.pm10, snapshot.pm2_5
+    european_aqi, wind_direction = snapshot.european_aqi, snapshot.wind_direction
+
     pm10_text.set_text(f"PM10: {pm10:.1f} μg/m³")
     pm2_5_text.set_text(f"PM2.5: {pm2_5:.1f} μg/m³")
     aqi_text.set_text(f"European AQI: {european_aqi}")
@@ -1317,82 +1230,93 @@ def update_real_time_data():
         current_sector.set_color(lc.Color(255, 0, 0, 128))
         current_sector.set_stroke(color=lc.Color("white"), thickness=1)
 
-    for key, series in series_map_line.items():
-        value = float(real_time_air.get(key, 0))
-        series.add([timestamp], [value])
-    line_chart.get_default_x_axis().fit()
-
-    for key, series in series_map_aqi.items():
-        value = float(real_time_air.get(key, 0))
-        series.add([timestamp], [value])
-    chart_aqi.get_default_x_axis().fit()
+    # Stale payloads repeat an old reading, so they add no new points.
+    if not snapshot.stale:
+        line_batcher.add(snapshot.timestamp, snapshot.line_values)
+        aqi_batcher.add(snapshot.timestamp, snapshot.aqi_values)
+    chart_air_quality.set_title(
+        "Air Quality Overview (stale)" if snapshot.stale else "Air Quality Overview"
+    )
 
     if current_radar_series is None:
         current_radar_series = radar_chart.add_series()
         current_radar_series.set_name("Real-Time Air Quality Data")
         # legend_radar.add(data=current_radar_series)
     # Real-time data update for radar chart with shorter names
-    radar_data = []
-    for key, label in aqi_components.items():
-        value = float(real_time_air.get(key, 0))
-        radar_data.append({"axis": label, "value": value})
-    series_radar.add_points(radar_data)
-
-    try:
-        uv = float(real_time_uv)
-    except (KeyError, ValueError, TypeError):
-        uv = 0.0
-    # print(f"Extracted Real-Time UV Index: {uv}")
-    gauge_chart.set_value(uv)
-
-    try:
-        weather_code = int(real_time_weather)
-    except (KeyError, ValueError, TypeError):
-        weather_code = 3
-    update_weather_3d_model(weather_code)
+    series_radar.add_points(list(snapshot.radar_data))
 
-    current_temp_text.set_text(f"Current: {current_temp:.1f}°C")
-    high_temp_text.set_text(f"High: {high_temp:.1f}°C")
-    low_temp_text.set_text(f"Low: {low_temp:.1f}°C")
+    gauge_chart.set_value(snapshot.uv)
+    update_air_quality_3d_model(european_aqi)
 
-    print(f"Updated Real-Time Data at {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    # print(
-    #     f"Wind Direction: {wind_direction}, PM10: {pm10}, PM2.5: {pm2_5}, AQI: {european_aqi}"
-    # )
+    # The next 6 hours repeat the real-time values
+    update_next_6_hour_air_quality([european_aqi for _ in range(6)])
+    update_next_6_hour_pm10([pm10 for _ in range(6)])
+    update_next_6_hour_pm2_5([pm2_5 for _ in range(6)])
 
-    update_air_quality_3d_model(european_aqi)
+    print(f"Updated Real-Time Air Quality at {snapshot.time:%Y-%m-%d %H:%M:%S}")
 
-    # Update the "next 6 hours" text boxes using the current time as the base.
-    update_next_hours(current_time)
 
-    # Generate next 6 hours AQI values using real-time base AQI
-    future_aqi_values = [european_aqi for _ in range(6)]
-    update_next_6_hour_air_quality(future_aqi_values)
+def apply_forecast_snapshot(snapshot):
+    update_weather_3d_model(snapshot.weather_code)
+    chart_temp.set_title(
+        "Temperature Overview (stale)" if snapshot.stale else "Temperature Overview"
+    )
 
-    # Generate next 6 hours temperature values using real-time base temperature
-    future_temp_values = [current_temp for _ in range(6)]
-    update_next_6_hour_temperatures(future_temp_values)
+    current_temp_text.set_text(f"Current: {snapshot.current_temp:.1f}°C")
+    high_temp_text.set_text(f"High: {snapshot.high_temp:.1f}°C")
+    low_temp_text.set_text(f"Low: {snapshot.low_temp:.1f}°C")
 
-    # Generate next 6 hours humidity values using real-time base humidity
-    real_time_humidity = fetch_real_time_humidity()  # Now we have the function!
-    future_humidity_values = [real_time_humidity for _ in range(6)]
-    update_next_6_hour_humidity(future_humidity_values)
+    update_next_6_hour_temperatures([snapshot.current_temp for _ in range(6)])
+    update_next_6_hour_humidity([snapshot.humidity for _ in range(6)])
+    print("Updated Real-Time Forecast")
 
-    # Generate next 6 hours PM10 values using real-time base PM10
-    future_pm10_values = [pm10 for _ in range(6)]
-    update_next_6_hour_pm10(future_pm10_values)
 
-    # Generate next 6 hours PM2.5 values using real-time base PM2.5
-    future_pm2_5_values = [pm2_5 for _ in range(6)]
-    update_next_6_hour_pm2_5(future_pm2_5_values)
+def apply_real_time_snapshot(snapshot):
+    """Apply a snapshot of any feed to the charts. Runs on the render thread."""
+    if isinstance(snapshot, AirQualitySnapshot):
+        apply_air_quality_snapshot(snapshot)
+    else:
+        apply_forecast_snapshot(snapshot)
 
 
 dashboard.open(live=True)
 
-# Stream historical data until current time:
-stream_historical_data()
-
-# Start real-time updates:
-while True:
-    update_real_time_data()
-    time.sleep(0.1)
+# Load historical data until current time, either all at once or as an
+# animated hour-by-hour playback:
+if HISTORY_MODE == "playback":
+    stream_historical_data(speed=PLAYBACK_SPEED)
+else:
+    load_historical_data()
+
+# Start real-time updates: every feed is fetched on the scheduler thread at its
+# own period, so a slow response never blocks the render loop below.
+render_loop = RenderLoop(
+    apply_real_time_snapshot, frame_interval=FRAME_INTERVAL, on_frame=update_clock
+)
+poll_scheduler = (
+    PollScheduler()
+    .add(
+        "air_quality",
+        build_air_quality_snapshot,
+        AIR_QUALITY_PERIOD,
+        jitter=FEED_JITTER,
+        publish=render_loop.publish,
+    )
+    .add(
+        "forecast",
+        build_forecast_snapshot,
+        FORECAST_PERIOD,
+        jitter=FEED_JITTER,
+        publish=render_loop.publish,
+    )
+    .start()
+)
+try:
+    render_loop.run()
+except KeyboardInterrupt:
+    print("Stopping real-time updates")
+finally:
+    poll_scheduler.stop()
+    line_batcher.flush()
+    aqi_batcher.flush()
+    open_meteo.client.close()
@@ -0,0 +1,208 @@
+"""Pluggable data sources behind the Open-Meteo client.
+
+The source is picked from the environment so both dashboards can run without
+outside network access:
+
+    OPEN_METEO_SOURCE=live   real Open-Meteo APIs (default)
+    OPEN_METEO_SOURCE=stub   HTTP server replaying captures, see OPEN_METEO_STUB_URL
+    OPEN_METEO_SOURCE=file   captures read directly from OPEN_METEO_CAPTURE_DIR
+
+Live and stub requests are limited per host to OPEN_METEO_RATE_LIMIT requests
+per minute (default 60). Processes that set the same OPEN_METEO_RATE_LIMIT_FILE
+share one budget.
+
+Setting OPEN_METEO_RECORD_DIR while running live writes every response as a
+capture that the stub and file sources can replay later. Recording and replay
+runs bypass the local history database (history_store.py). The stub server is
+started with:
+
+    python Python/data_sources.py serve --dir captures --port 8765
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit import DEFAULT_REQUESTS_PER_MINUTE, RateLimitedDataSource
+from resilience import ResilientDataSource
+from response_cache import VOLATILE_PARAMS, normalize_value
+
+# One keep-alive pool per Open-Meteo host. Both dashboards only talk to these two.
+API_HOSTS = (
+    "https://air-quality-api.open-meteo.com",
+    "https://api.open-meteo.com",
+)
+
+# Connect and read timeouts of every HTTP request, in seconds.
+REQUEST_TIMEOUT = (5, 15)
+
+DEFAULT_CAPTURE_DIR = "captures"
+DEFAULT_STUB_URL = "http://127.0.0.1:8765"
+
+
+def capture_name(url, params):
+    """File name (without extension) of the capture for a request. Volatile
+    parameters are left out so a recording keeps matching later runs."""
+    parts = urlsplit(url)
+    normalized = []
+    for key, value in sorted(params.items()):
+        if key in VOLATILE_PARAMS:
+            continue
+        normalized.append(f"{key}={normalize_value(key, value)}")
+    digest = hashlib.sha1("&".join(normalized).encode()).hexdigest()[:12]
+    prefix = f"{parts.netloc}{parts.path}".strip("/").replace("/", "_")
+    return f"{prefix}-{digest}"
+
+
+class HttpDataSource:
+    """Fetches over HTTP, reusing TCP/TLS connections per host.
+
+    With `base_url` set, requests for the Open-Meteo hosts are sent to that
+    server instead, e.g. the stub started by `serve_captures`.
+    """
+
+    def __init__(self, base_url=None, pool_maxsize=4, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.timeout = timeout
+        self.session = requests.Session()
+        for host in API_HOSTS + ((self.base_url,) if self.base_url else ()):
+            self.session.mount(
+                host, HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            )
+
+    def fetch(self, url, params):
+        if self.base_url:
+            parts = urlsplit(url)
+            url = f"{self.base_url}/{parts.netloc}{parts.path}"
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json(), response.headers
+
+    def close(self):
+        self.session.close()
+
+
+class FileDataSource:
+    """Reads recorded captures: `<name>.json` payloads or `<name>.parquet` frames
+    with a `time` column and one column per hourly variable."""
+
+    def __init__(self, directory=DEFAULT_CAPTURE_DIR):
+        self.directory = directory
+
+    def fetch(self, url, params):
+        path = os.path.join(self.directory, capture_name(url, params))
+        if os.path.exists(path + ".json"):
+            with open(path + ".json", encoding="utf-8") as f:
+                return json.load(f), {}
+        if os.path.exists(path + ".parquet"):
+            df = pd.read_parquet(path + ".parquet")
+            df["time"] = df["time"].astype(str)
+            return {"hourly": df.to_dict(orient="list")}, {}
+        raise FileNotFoundError(f"No capture for {url} {params} in {self.directory}")
+
+    def close(self):
+        pass
+
+
+class RecordingDataSource:
+    """Wraps another source and writes every response as a JSON capture."""
+
+    def __init__(self, source, directory=DEFAULT_CAPTURE_DIR):
+        self.source = source
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def fetch(self, url, params):
+        data, headers = self.source.fetch(url, params)
+        path = os.path.join(self.directory, capture_name(url, params) + ".json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return data, headers
+
+    def close(self):
+        self.source.close()
+
+
+def from_config(environ=os.environ):
+    """Create the data source selected by the OPEN_METEO_* environment variables."""
+    kind = environ.get("OPEN_METEO_SOURCE", "live")
+    capture_dir = environ.get("OPEN_METEO_CAPTURE_DIR", DEFAULT_CAPTURE_DIR)
+    if kind == "file":
+        source = FileDataSource(capture_dir)
+    elif kind in ("live", "stub"):
+        base_url = environ.get("OPEN_METEO_STUB_URL", DEFAULT_STUB_URL)
+        # Rate limiting sits inside the retries, so every attempt takes a token.
+        source = ResilientDataSource(
+            RateLimitedDataSource(
+                HttpDataSource(base_url if kind == "stub" else None),
+                requests_per_minute=float(
+                    environ.get("OPEN_METEO_RATE_LIMIT", DEFAULT_REQUESTS_PER_MINUTE)
+                ),
+                path=environ.get("OPEN_METEO_RATE_LIMIT_FILE"),
+            )
+        )
+    else:
+        raise ValueError(f"Unknown OPEN_METEO_SOURCE: {kind}")
+
+    record_dir = environ.get("OPEN_METEO_RECORD_DIR")
+    if record_dir:
+        source = RecordingDataSource(source, record_dir)
+    return source
+
+
+def stores_history(environ=os.environ):
+    """Whether the local history database is used. Only for plain live runs: a
+    recording must contain the full requests so that replays find them, and
+    replayed captures must not end up in the live history."""
+    return environ.get("OPEN_METEO_SOURCE", "live") == "live" and not environ.get(
+        "OPEN_METEO_RECORD_DIR"
+    )
+
+
+def serve_captures(directory=DEFAULT_CAPTURE_DIR, host="127.0.0.1", port=8765):
+    """Serve captures over HTTP at /<api host>/<api path>?<params>."""
+    files = FileDataSource(directory)
+
+    class CaptureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            url = "https://" + parts.path.lstrip("/")
+            params = dict(parse_qsl(parts.query))
+            try:
+                data, _ = files.fetch(url, params)
+            except FileNotFoundError as e:
+                self.send_error(404, str(e))
+                return
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), CaptureHandler)
+    print(f"Replaying captures from {directory} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="replay captures over HTTP")
+    serve.add_argument("--dir", default=DEFAULT_CAPTURE_DIR)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    serve_captures(args.dir, args.host, args.port)
@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+import data_sources
+import open_meteo
+
+# Local SQLite file holding the hourly observations downloaded so far. It keeps
+# growing past the API's past_days window, one row per location/variable/hour.
+DEFAULT_PATH = "history.sqlite3"
+
+# Time format used by Open-Meteo for hourly timestamps and start_hour/end_hour.
+TIME_FORMAT = "%Y-%m-%dT%H:%M"
+
+
+def location_key(latitude, longitude):
+    return f"{float(latitude):.4f},{float(longitude):.4f}"
+
+
+class HistoryStore:
+    """Hourly observations per location and variable, stored in SQLite.
+
+    `get_json` has the same signature as `open_meteo.get_json`, so it can be used
+    as the fetch function of a RequestPlan. Instead of downloading the whole
+    past_days window it loads the stored hours and only requests the missing
+    tail (plus the forecast) from the API.
+
+    The store is only used for live runs (see data_sources.stores_history);
+    otherwise `get_json` passes every request through unchanged.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, enabled=None):
+        self.enabled = data_sources.stores_history() if enabled is None else enabled
+        self.lock = threading.Lock()
+        if not self.enabled:
+            return
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS observations ("
+                "location TEXT, variable TEXT, time TEXT, value REAL, "
+                "PRIMARY KEY (location, variable, time)) WITHOUT ROWID"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS locations ("
+                "location TEXT PRIMARY KEY, utc_offset_seconds INTEGER)"
+            )
+
+    def utc_offset(self, location):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT utc_offset_seconds FROM locations WHERE location = ?",
+                (location,),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def stored_range(self, location, variables):
+        """(first, last) hour stored for every one of `variables`, or None."""
+        firsts, lasts = [], []
+        with self.lock:
+            for variable in variables:
+                row = self.connection.execute(
+                    "SELECT MIN(time), MAX(time) FROM observations "
+                    "WHERE location = ? AND variable = ?",
+                    (location, variable),
+                ).fetchone()
+                if row[0] is None:
+                    return None
+                firsts.append(row[0])
+                lasts.append(row[1])
+        return (
+            datetime.strptime(max(firsts), TIME_FORMAT),
+            datetime.strptime(min(lasts), TIME_FORMAT),
+        )
+
+    def load(self, location, variables, start, end):
+        """Stored hours in [start, end) as an Open-Meteo style `hourly` block."""
+        start, end = start.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)
+        columns = {}
+        with self.lock:
+            for variable in variables:
+                columns[variable] = dict(
+                    self.connection.execute(
+                        "SELECT time, value FROM observations "
+                        "WHERE location = ? AND variable = ? "
+                        "AND time >= ? AND time < ? ORDER BY time",
+                        (location, variable, start, end),
+                    ).fetchall()
+                )
+        times = sorted(set().union(*(c.keys() for c in columns.values())))
+        hourly = {"time": times}
+        for variable, values in columns.items():
+            hourly[variable] = [values.get(t) for t in times]
+        return hourly
+
+    def append(self, location, hourly, until, utc_offset_seconds):
+        """Store every hour of `hourly` up to and including `until`."""
+        until = until.strftime(TIME_FORMAT)
+        times = hourly.get("time", [])
+        rows = [
+            (location, variable, t, value)
+            for variable, values in hourly.items()
+            if variable != "time"
+            for t, value in zip(times, values)
+            if t <= until and value is not None
+        ]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO locations VALUES (?, ?)",
+                (location, utc_offset_seconds),
+            )
+
+    def get_json(self, url, params):
+        variables = params.get("hourly", "")
+        variables = variables.split(",") if isinstance(variables, str) else variables
+        if not self.enabled or not variables or "past_days" not in params:
+            return open_meteo.get_json(url, params)
+        if "," in str(params["latitude"]):
+            # Multi-location requests are not stored.
+            return open_meteo.get_json(url, params)
+
+        location = location_key(params["latitude"], params["longitude"])
+        utc_offset_seconds = self.utc_offset(location)
+        stored_range = self.stored_range(location, variables)
+
+        request_params = dict(params)
+        stored = None
+        if utc_offset_seconds is not None and stored_range is not None:
+            first, last = stored_range
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            now += timedelta(seconds=utc_offset_seconds)
+            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            window_start = today - timedelta(days=params["past_days"])
+            window_end = today + timedelta(days=params.get("forecast_days", 7))
+            # The store must cover the start of the window; otherwise the
+            # full `past_days` request fills the missing head.
+            if first <= window_start <= last:
+                # Only ask for the hours after the last stored one.
+                tail_start = last + timedelta(hours=1)
+                stored = self.load(location, variables, window_start, tail_start)
+                del request_params["past_days"]
+                request_params.pop("forecast_days", None)
+                request_params["start_hour"] = tail_start.strftime(TIME_FORMAT)
+                request_params["end_hour"] = (window_end - timedelta(hours=1)).strftime(
+                    TIME_FORMAT
+                )
+
+        if "start_hour" in request_params and (
+            request_params["start_hour"] > request_params["end_hour"]
+        ):
+            # Everything is stored already; only other blocks still need a request.
+            del request_params["hourly"]
+            del request_params["start_hour"]
+            del request_params["end_hour"]
+            if "current" not in request_params:
+                return {"utc_offset_seconds": utc_offset_seconds, "hourly": stored}
+
+        data = open_meteo.get_json(url, request_params)
+        hourly = data.get("hourly", {})
+        utc_offset_seconds = data.get("utc_offset_seconds", utc_offset_seconds or 0)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        now += timedelta(seconds=utc_offset_seconds)
+        self.append(location, hourly, now, utc_offset_seconds)
+
+        if stored is None:
+            return data
+        merged = {
+            key: stored.get(key, []) + list(hourly.get(key, []))
+            for key in ["time"] + list(variables)
+        }
+        return dict(data, hourly=merged)
@@ -0,0 +1,95 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+
+OBJECTS_DIR = "Objects"
+# Built by build_meshes.py: float32 vertices/normals and uint32 indices for every
+# OBJ model under Objects/, stored as "<model>:vertices", "<model>:indices", ...
+# Reduced level-of-detail variants are stored as "<model>@<faces>:vertices", ...
+BUNDLE_PATH = os.path.join(OBJECTS_DIR, "meshes.npz")
+
+# Face budgets of the level-of-detail variants built for every larger model, and
+# the number of faces one dashboard cell can show without visible loss.
+LOD_FACE_BUDGETS = (1200, 300)
+FACES_PER_CELL = 300
+
+_bundle = None
+
+
+def open_bundle():
+    """The mesh bundle, or None if it has not been built."""
+    global _bundle
+    if _bundle is None and os.path.exists(BUNDLE_PATH):
+        _bundle = np.load(BUNDLE_PATH)
+    return _bundle
+
+
+def face_budget(row_span, column_span):
+    """Face budget of a 3D chart spanning the given number of dashboard cells."""
+    return FACES_PER_CELL * row_span * column_span
+
+
+def lod_name(name, budget):
+    return f"{name}@{budget}"
+
+
+def load_trimesh(name):
+    """Parse Objects/<name> with trimesh. Only used when the bundle is missing
+    a model, and by the build step itself."""
+    import trimesh  # Ensure trimesh is installed: pip install trimesh
+
+    scene = trimesh.load(os.path.join(OBJECTS_DIR, name))
+    return scene.dump(concatenate=True) if isinstance(scene, trimesh.Scene) else scene
+
+
+def mesh_arrays(mesh):
+    return (
+        mesh.vertices.astype(np.float32).ravel(),
+        mesh.faces.astype(np.uint32).ravel(),
+        mesh.vertex_normals.astype(np.float32).ravel(),
+    )
+
+
+def pick_lod(bundle, name, max_faces):
+    """Bundle entry of `name` to use for a chart that can show `max_faces`."""
+    if max_faces is None or bundle[f"{name}:indices"].size // 3 <= max_faces:
+        return name
+    # Simplification does not hit the budget exactly, so compare the real
+    # face count of every variant.
+    variants = {}
+    for budget in LOD_FACE_BUDGETS:
+        entry = lod_name(name, budget)
+        if f"{entry}:indices" in bundle.files:
+            variants[entry] = bundle[f"{entry}:indices"].size // 3
+    fitting = [entry for entry, faces in variants.items() if faces <= max_faces]
+    if fitting:
+        return max(fitting, key=variants.get)
+    if variants:
+        return min(variants, key=variants.get)
+    return name
+
+
+@lru_cache(maxsize=None)
+def load_mesh(name, max_faces=None):
+    """Vertices, indices and normals of Objects/<name> as flat lists, or
+    (None, None, None) if the model cannot be loaded. With `max_faces` the
+    largest level-of-detail variant within that budget is returned. Results are
+    cached, so callers must not modify the returned lists."""
+    bundle = open_bundle()
+    try:
+        if bundle is not None and f"{name}:vertices" in bundle.files:
+            entry = pick_lod(bundle, name, max_faces)
+            arrays = (
+                bundle[f"{entry}:vertices"],
+                bundle[f"{entry}:indices"],
+                bundle[f"{entry}:normals"],
+            )
+        else:
+            if max_faces is not None:
+                print(f"Mesh bundle missing {name}; loading full geometry")
+            arrays = mesh_arrays(load_trimesh(name))
+    except Exception as e:
+        print(f"Error loading {name}: {e}")
+        return None, None, None
+    return tuple(array.tolist() for array in arrays)
@@ -0,0 +1,191 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import data_sources
+import resilience
+from response_cache import ResponseCache, cache_key
+
+AIR_QUALITY_API_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+FORECAST_API_URL = "https://api.open-meteo.com/v1/forecast"
+
+
+class OpenMeteoClient:
+    """Shared client in front of a data source (live HTTP with pooled keep-alive
+    connections by default) that serves repeated requests from a cache until
+    upstream can have changed."""
+
+    def __init__(self, source=None):
+        self.source = data_sources.HttpDataSource() if source is None else source
+        self.cache = ResponseCache()
+
+    def get_json(self, url, params):
+        key = cache_key(url, params)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        try:
+            data, headers = self.source.fetch(url, params)
+        except Exception as e:
+            # Keep the dashboard going on the last good payload while upstream
+            # is unhealthy; the caller can tell from the stale marker.
+            data = self.stale_copy(url, params)
+            if data is None:
+                raise
+            print(f"Serving stale data for {url}: {e}")
+            return data
+        self.cache.put(url, params, data, headers)
+        return data
+
+    def stale_copy(self, url, params):
+        """Last good payload of a request marked as stale, or None."""
+        data = self.cache.get_stale(cache_key(url, params))
+        if data is None:
+            return None
+        if isinstance(data, list):
+            return [dict(d, **{resilience.STALE_KEY: True}) for d in data]
+        return dict(data, **{resilience.STALE_KEY: True})
+
+    def close(self):
+        self.source.close()
+
+
+# Module level client so every fetcher in the process shares the same pools and
+# cache. The data source is selected by the OPEN_METEO_* environment variables.
+client = OpenMeteoClient(data_sources.from_config())
+
+
+def get_json(url, params):
+    return client.get_json(url, params)
+
+
+def is_stale(data):
+    """Whether a payload was served from the cache while upstream failed."""
+    payloads = data if isinstance(data, list) else [data]
+    return any(payload.get(resilience.STALE_KEY) for payload in payloads)
+
+
+# Threads that run the blocking fetches of RequestPlan. Shared and long-lived, so
+# a straggler left behind by a deadline never holds up the next tick; it ends
+# when the data source's own request timeout expires.
+fetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="open-meteo")
+
+
+def parse_locations(text):
+    """Parse "lat,lon;lat,lon;..." into a list of (latitude, longitude)."""
+    locations = []
+    for item in text.split(";"):
+        if item.strip():
+            latitude, longitude = item.split(",")
+            locations.append((float(latitude), float(longitude)))
+    return locations
+
+
+class RequestPlan:
+    """Collects the `current`/`hourly` variables every consumer needs and
+    issues a single request per API URL instead of one per variable.
+
+    `latitude` and `longitude` may also be sequences, in which case every
+    location is fetched in the same request and each payload is a list with
+    one entry per location; see split_locations.
+    """
+
+    def __init__(self, latitude, longitude, timezone="auto"):
+        if isinstance(latitude, (list, tuple)):
+            latitude = ",".join(str(v) for v in latitude)
+            longitude = ",".join(str(v) for v in longitude)
+        self.base_params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone": timezone,
+        }
+        self.requests = {}
+
+    @classmethod
+    def for_locations(cls, locations, timezone="auto"):
+        """Plan for a list of (latitude, longitude) pairs."""
+        latitudes, longitudes = zip(*locations)
+        return cls(list(latitudes), list(longitudes), timezone)
+
+    def add(self, url, current=(), hourly=(), **params):
+        entry = self.requests.setdefault(
+            url, {"current": [], "hourly": [], "params": {}}
+        )
+        for key, variables in (("current", current), ("hourly", hourly)):
+            for variable in variables:
+                if variable not in entry[key]:
+                    entry[key].append(variable)
+        for key, value in params.items():
+            if entry["params"].get(key, value) != value:
+                raise ValueError(
+                    f"Conflicting values for '{key}' on {url}: "
+                    f"{entry['params'][key]} != {value}"
+                )
+            entry["params"][key] = value
+        return self
+
+    def build_params(self, url):
+        entry = self.requests[url]
+        params = dict(self.base_params, **entry["params"])
+        for key in ("current", "hourly"):
+            if entry[key]:
+                params[key] = ",".join(entry[key])
+        return params
+
+    def execute(self, fetch=None, deadline=None):
+        """Fetch every planned URL once and return {url: json payload}.
+
+        Requests to different hosts are issued concurrently, so the total time
+        is bounded by the slowest host instead of the sum of all of them.
+        `fetch` defaults to get_json and can be replaced by anything with the
+        same signature, e.g. HistoryStore.get_json. With `deadline` (seconds)
+        requests still running after it are cancelled and answered with the
+        last cached payload, marked stale; TimeoutError is raised if there is
+        none.
+        """
+        return asyncio.run(self.execute_async(fetch, deadline))
+
+    async def execute_async(self, fetch=None, deadline=None):
+        fetch = get_json if fetch is None else fetch
+        loop = asyncio.get_running_loop()
+        tasks = {
+            url: loop.run_in_executor(
+                fetch_executor, fetch, url, self.build_params(url)
+            )
+            for url in self.requests
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        results = {}
+        for url, task in tasks.items():
+            if task not in pending:
+                results[url] = task.result()
+                continue
+            task.cancel()
+            stale = client.stale_copy(url, self.build_params(url))
+            if stale is None:
+                raise TimeoutError(f"No response within {deadline} s from {url}")
+            print(f"Serving stale data for {url}: no response within {deadline} s")
+            results[url] = stale
+        return results
+
+
+def hourly_frame(data, tz):
+    """Convert the `hourly` block of a payload to a DataFrame indexed by Time."""
+    df = pd.DataFrame(data.get("hourly", {}))
+    df.rename(columns={"time": "Time"}, inplace=True)
+    df["Time"] = pd.to_datetime(df["Time"]).dt.tz_localize("UTC").dt.tz_convert(tz)
+    return df.set_index("Time")
+
+
+def split_locations(data):
+    """Per-location payloads of a response, in the order the locations were
+    requested. Single-location responses are a dict, multi-location ones a list."""
+    return data if isinstance(data, list) else [data]
+
+
+def location_frames(data, tz):
+    """Demultiplex the `hourly` block of a (multi-location) payload into one
+    DataFrame per location, indexed by Time."""
+    return [hourly_frame(payload, tz) for payload in split_locations(data)]
@@ -0,0 +1,146 @@
+"""Client-side request budgets for the Open-Meteo hosts.
+
+RateLimitedDataSource gives every host a token bucket. A request takes one token
+and waits (up to `max_wait` seconds) for one if the bucket is empty. If none
+becomes available it fails with RateLimitedError, and OpenMeteoClient serves the
+last cached payload instead, so a busy machine degrades to slightly older data
+rather than to HTTP 429s.
+
+With a state file the buckets are shared by every process on the machine that
+uses the same file, e.g. several dashboards against one API quota. The file is
+locked while a bucket is updated.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Requests per minute and burst size of every host's bucket.
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_BURST = 10
+# Seconds a request may queue for a token before it is given up.
+MAX_WAIT = 5.0
+
+
+class RateLimitedError(Exception):
+    pass
+
+
+def lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second up to `capacity`. The state lives in
+    memory, or under `name` in the JSON file at `path` to share it between
+    processes."""
+
+    def __init__(self, rate, capacity, name="default", path=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self.path = path
+        self.lock = threading.Lock()
+        self.tokens = capacity
+        self.updated = time.time()
+
+    def take(self, now):
+        """Take a token if available. Returns 0, or the seconds until the next
+        token will be available."""
+        with self.lock:
+            if self.path is None:
+                self.tokens, self.updated, wait = self.refill(
+                    self.tokens, self.updated, now
+                )
+                return wait
+            with open(self.path, "a+", encoding="utf-8") as f:
+                lock_file(f)
+                try:
+                    f.seek(0)
+                    content = f.read()
+                    state = json.loads(content) if content.strip() else {}
+                    tokens, updated = state.get(self.name, (self.capacity, now))
+                    tokens, updated, wait = self.refill(tokens, updated, now)
+                    state[self.name] = (tokens, updated)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    unlock_file(f)
+            return wait
+
+    def refill(self, tokens, updated, now):
+        tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, now, 0.0
+        return tokens, now, (1 - tokens) / self.rate
+
+    def acquire(self, timeout=MAX_WAIT):
+        """Wait up to `timeout` seconds for a token. Returns whether one was taken."""
+        deadline = time.time() + timeout
+        while True:
+            now = time.time()
+            wait = self.take(now)
+            if wait == 0:
+                return True
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class RateLimitedDataSource:
+    """Wraps another source with one token bucket per host."""
+
+    def __init__(
+        self,
+        source,
+        requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+        burst=DEFAULT_BURST,
+        path=None,
+        max_wait=MAX_WAIT,
+    ):
+        self.source = source
+        self.rate = requests_per_minute / 60
+        self.burst = burst
+        self.path = path
+        self.max_wait = max_wait
+        self.buckets = {}
+        self.lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst, host, self.path)
+            return self.buckets[host]
+
+    def fetch(self, url, params):
+        if not self.bucket(url).acquire(self.max_wait):
+            raise RateLimitedError(f"Request budget for {urlsplit(url).netloc} used up")
+        return self.source.fetch(url, params)
+
+    def close(self):
+        self.source.close()
@@ -0,0 +1,169 @@
+"""Retries and circuit breaking for the Open-Meteo data sources.
+
+ResilientDataSource wraps any data source. Transient failures (connection
+errors, timeouts, HTTP 429 and 5xx) are retried with exponential backoff and
+full jitter, or after the delay the server asks for in Retry-After. Repeated
+failures open a per-host circuit breaker that fails fast until the host has had
+time to recover, so a degraded API is not hammered by every dashboard at once.
+While a request fails, OpenMeteoClient serves the last good payload from its
+cache, marked with STALE_KEY.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+from rate_limit import RateLimitedError
+
+RETRY_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# Consecutive failed requests that open a host's breaker, and seconds it stays
+# open before a single trial request is let through.
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 60.0
+
+# Key added to payloads served from the cache while upstream is unhealthy.
+STALE_KEY = "_stale"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def backoff_delay(attempt):
+    """Seconds to wait before retry number `attempt` (0-based), with full jitter."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def retry_after(error):
+    """Seconds from the Retry-After header of an HTTP error response, or None."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient(error):
+    """Whether `error` is worth retrying and says something about host health."""
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status is None or status == 429 or status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class CircuitBreaker:
+    """Closed while requests succeed. Opens after `failure_threshold`
+    consecutive failures and rejects requests for `reset_timeout` seconds, then
+    lets one trial request through (half-open) that closes or reopens it."""
+
+    def __init__(
+        self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def release(self):
+        """End a request that says nothing about the host's health."""
+        with self.lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+
+class ResilientDataSource:
+    """Wraps another source with retries and one circuit breaker per host.
+
+    Every attempt goes through the wrapped source, so a RateLimitedDataSource
+    inside it charges each retry against the request budget.
+    """
+
+    def __init__(self, source, attempts=RETRY_ATTEMPTS):
+        self.source = source
+        self.attempts = attempts
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def breaker(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker()
+            return self.breakers[host]
+
+    def fetch(self, url, params):
+        breaker = self.breaker(url)
+        for attempt in range(self.attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+            try:
+                result = self.source.fetch(url, params)
+            except RateLimitedError:
+                # The request never left the process.
+                breaker.release()
+                raise
+            except Exception as e:
+                if not is_transient(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == self.attempts - 1:
+                    raise
+                delay = retry_after(e)
+                if delay is None:
+                    delay = backoff_delay(attempt)
+                elif delay > BACKOFF_MAX:
+                    # Not worth waiting for; the caller falls back to the cache.
+                    raise
+                print(f"Retrying {url} in {delay:.1f} s after error: {e}")
+                time.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    def close(self):
+        self.source.close()
@@ -0,0 +1,130 @@
+import math
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# How often Open-Meteo can publish a new value, in seconds. Hourly series and the
+# air-quality model change once an hour, the forecast API's `current` block is
+# refreshed every 15 minutes.
+HOURLY_UPDATE_PERIOD = 3600
+CURRENT_UPDATE_PERIODS = {
+    "https://air-quality-api.open-meteo.com/v1/air-quality": 3600,
+    "https://api.open-meteo.com/v1/forecast": 900,
+}
+# Per-variable overrides for anything that changes slower or faster than its block.
+VARIABLE_UPDATE_PERIODS = {}
+
+# Upstream publishes a little after the period boundary, so keep serving the cached
+# payload for this long past it to avoid re-caching the old value for a whole period.
+UPDATE_GRACE = 60
+
+
+# Comma-separated parameters whose order matters: the n-th latitude belongs to
+# the n-th longitude in multi-location requests.
+ORDERED_PARAMS = {"latitude", "longitude", "elevation", "timezone"}
+
+# Parameters that move with the clock, e.g. the tail window HistoryStore asks
+# for. Requests that differ only in these replace each other in the cache.
+VOLATILE_PARAMS = {"start_hour", "end_hour", "past_hours", "forecast_hours"}
+
+
+def normalize_value(key, value):
+    if isinstance(value, (list, tuple)):
+        value = ",".join(str(v) for v in value)
+    if key in ORDERED_PARAMS:
+        return str(value)
+    return ",".join(sorted(str(value).split(",")))
+
+
+def cache_key(url, params):
+    """Build a key that does not depend on parameter order or value types."""
+    normalized = [
+        (key, normalize_value(key, value)) for key, value in sorted(params.items())
+    ]
+    return url, tuple(normalized)
+
+
+def slot_key(key):
+    """`key` without the volatile parameters."""
+    url, normalized = key
+    return url, tuple(item for item in normalized if item[0] not in VOLATILE_PARAMS)
+
+
+def update_period(url, params):
+    """Shortest update period of all variables requested in `params`."""
+    periods = []
+    for block in ("current", "hourly"):
+        variables = params.get(block)
+        if not variables:
+            continue
+        if isinstance(variables, str):
+            variables = variables.split(",")
+        if block == "current":
+            default = CURRENT_UPDATE_PERIODS.get(url, HOURLY_UPDATE_PERIOD)
+        else:
+            default = HOURLY_UPDATE_PERIOD
+        periods.extend(VARIABLE_UPDATE_PERIODS.get(v, default) for v in variables)
+    return min(periods, default=HOURLY_UPDATE_PERIOD)
+
+
+def expiry_from_headers(headers, now):
+    """Expiry time from Cache-Control max-age or Expires, or None if absent."""
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() in ("no-store", "no-cache"):
+            return now
+        if name.lower() == "max-age" and value.isdigit():
+            return now + int(value)
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return None
+
+
+def expiry_from_period(period, now):
+    """Next period boundary (plus grace) at which upstream can have changed."""
+    return math.floor((now - UPDATE_GRACE) / period) * period + period + UPDATE_GRACE
+
+
+class ResponseCache:
+    """Thread-safe TTL cache for decoded JSON payloads.
+
+    Holds one entry per request minus its volatile parameters, so a moving
+    `start_hour`/`end_hour` window does not add a new entry every hour.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.entries.get(slot_key(key))
+        if entry is None or entry[0] != key or entry[2] <= now:
+            return None
+        return entry[1]
+
+    def get_stale(self, key):
+        """Last payload stored under `key`, even if it has expired."""
+        with self.lock:
+            entry = self.entries.get(slot_key(key))
+        return None if entry is None or entry[0] != key else entry[1]
+
+    def put(self, url, params, data, headers=None, now=None):
+        now = time.time() if now is None else now
+        expires_at = expiry_from_headers(headers or {}, now)
+        if expires_at is None:
+            expires_at = expiry_from_period(update_period(url, params), now)
+        with self.lock:
+            key = cache_key(url, params)
+            self.entries[slot_key(key)] = (key, data, expires_at)
+        return expires_at
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
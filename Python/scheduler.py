@@ -0,0 +1,100 @@
+import heapq
+import random
+import threading
+import time
+from datetime import datetime
+
+from response_cache import expiry_from_period
+
+
+class PollJob:
+    def __init__(self, name, func, period, jitter, publish):
+        self.name = name
+        self.func = func
+        self.period = period
+        self.jitter = jitter
+        self.publish = publish
+        self.next_run = None
+        self.last_run = None
+
+    def schedule_after(self, now):
+        """Next run: the upstream period boundary after `now` (plus the cache's
+        grace, so the cached payload has expired), spread by a random jitter so
+        many dashboards do not all hit the API in the same second."""
+        self.next_run = expiry_from_period(self.period, now)
+        self.next_run += random.uniform(0, self.jitter)
+
+
+class PollScheduler:
+    """Runs data feeds on one background thread, each at its own period.
+
+    Runs are aligned to the period boundaries of the upstream data (e.g. every
+    10 minutes past the hour) instead of a fixed delay after the previous run,
+    and jittered. Every feed runs once right after `start`. A failing run is
+    logged and retried at the next boundary.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.heap = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.stopped = False
+        self.thread = threading.Thread(target=self.run, name="poll", daemon=True)
+
+    def add(self, name, func, period, jitter=30, publish=None):
+        """Run `func` every `period` seconds and pass each result to `publish`."""
+        job = PollJob(name, func, period, jitter, publish)
+        with self.lock:
+            self.jobs[name] = job
+            job.next_run = time.time()
+            heapq.heappush(self.heap, (job.next_run, name))
+            self.wakeup.notify()
+        return self
+
+    def next_runs(self):
+        """{feed name: datetime of its next run}, for logging and monitoring."""
+        with self.lock:
+            return {
+                name: datetime.fromtimestamp(job.next_run)
+                for name, job in self.jobs.items()
+            }
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop scheduling and wait for a run in progress to finish."""
+        with self.lock:
+            self.stopped = True
+            self.wakeup.notify()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    def run(self):
+        while True:
+            with self.lock:
+                while not self.stopped and (
+                    not self.heap or self.heap[0][0] > time.time()
+                ):
+                    timeout = self.heap[0][0] - time.time() if self.heap else None
+                    self.wakeup.wait(timeout)
+                if self.stopped:
+                    return
+                _, name = heapq.heappop(self.heap)
+                job = self.jobs[name]
+
+            try:
+                result = job.func()
+                if job.publish is not None:
+                    job.publish(result)
+            except Exception as e:
+                print(f"Error in feed {name}: {e}")
+
+            with self.lock:
+                job.last_run = time.time()
+                job.schedule_after(job.last_run)
+                heapq.heappush(self.heap, (job.next_run, name))
+            next_run = datetime.fromtimestamp(job.next_run)
+            print(f"Feed {name}: next run at {next_run:%H:%M:%S}")
@@ -0,0 +1,111 @@
+"""Monitor many sites at once with one request per Open-Meteo host per refresh.
+
+The sites are given as "lat,lon;lat,lon;..." in OPEN_METEO_LOCATIONS:
+
+    OPEN_METEO_LOCATIONS="60.1699,24.9384;59.3293,18.0686" python Python/sites.py
+
+Every refresh prints the current readings of each site and the peak of each
+air-quality variable over the hourly data of the last and next day.
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+import open_meteo
+from response_cache import CURRENT_UPDATE_PERIODS
+from scheduler import PollScheduler
+
+LOCATIONS = open_meteo.parse_locations(
+    os.environ.get("OPEN_METEO_LOCATIONS", "60.1699,24.9384")
+)
+
+AIR_QUALITY_API_URL = open_meteo.AIR_QUALITY_API_URL
+FORECAST_API_URL = open_meteo.FORECAST_API_URL
+AIR_QUALITY_VARIABLES = ["european_aqi", "pm2_5", "pm10", "nitrogen_dioxide", "ozone"]
+FORECAST_VARIABLES = ["temperature_2m", "relative_humidity_2m", "weather_code"]
+
+# Refresh as often as the faster of the two `current` blocks changes. The
+# deadline is twice the single-site dashboard's, as every response carries all
+# sites.
+REFRESH_PERIOD = CURRENT_UPDATE_PERIODS[FORECAST_API_URL]
+DEADLINE = 10.0
+
+sites_plan = open_meteo.RequestPlan.for_locations(LOCATIONS, timezone="UTC")
+sites_plan.add(
+    AIR_QUALITY_API_URL,
+    current=AIR_QUALITY_VARIABLES,
+    hourly=AIR_QUALITY_VARIABLES,
+    past_days=1,
+    forecast_days=1,
+)
+sites_plan.add(
+    FORECAST_API_URL,
+    current=FORECAST_VARIABLES,
+    hourly=FORECAST_VARIABLES,
+    past_days=1,
+    forecast_days=1,
+)
+
+# Result of one refresh: the current readings, one row per site, and the hourly
+# data of every site as one DataFrame each, in LOCATIONS order.
+SitesSnapshot = namedtuple("SitesSnapshot", ["current", "hourly"])
+
+
+def fetch_sites():
+    """Fetch every site and return a SitesSnapshot."""
+    payloads = sites_plan.execute(deadline=DEADLINE)
+    air = payloads[AIR_QUALITY_API_URL]
+    forecast = payloads[FORECAST_API_URL]
+
+    hourly_frames = [
+        air_frame.join(forecast_frame, how="outer")
+        for air_frame, forecast_frame in zip(
+            open_meteo.location_frames(air, "UTC"),
+            open_meteo.location_frames(forecast, "UTC"),
+        )
+    ]
+
+    rows = []
+    for (latitude, longitude), air_data, forecast_data in zip(
+        LOCATIONS,
+        open_meteo.split_locations(air),
+        open_meteo.split_locations(forecast),
+    ):
+        row = {"latitude": latitude, "longitude": longitude}
+        row.update(air_data.get("current", {}))
+        row.update(forecast_data.get("current", {}))
+        rows.append(row)
+    current = pd.DataFrame(
+        rows,
+        columns=["latitude", "longitude"] + AIR_QUALITY_VARIABLES + FORECAST_VARIABLES,
+    )
+    return SitesSnapshot(current, hourly_frames)
+
+
+def print_sites(snapshot):
+    print(snapshot.current.to_string(index=False))
+    peaks = pd.DataFrame(
+        [frame[AIR_QUALITY_VARIABLES].max() for frame in snapshot.hourly],
+        index=[f"{latitude},{longitude}" for latitude, longitude in LOCATIONS],
+    )
+    print("Peak hourly values:")
+    print(peaks.to_string())
+
+
+if __name__ == "__main__":
+    print(f"Monitoring {len(LOCATIONS)} sites")
+    poll_scheduler = (
+        PollScheduler()
+        .add("sites", fetch_sites, REFRESH_PERIOD, publish=print_sites)
+        .start()
+    )
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("Stopping")
+    finally:
+        poll_scheduler.stop()
+        open_meteo.client.close()
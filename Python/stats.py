@@ -0,0 +1,33 @@
+import math
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class RunningStats:
+    """Count, min, max and mean of a stream of values, updated in O(1) per value.
+    Missing values (None or NaN) are ignored."""
+
+    def __init__(self, values=()):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        if _missing(value):
+            return self
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None